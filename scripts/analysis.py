@@ -23,6 +23,7 @@ import numpy as np
 import polars as pl
 
 from eval_utils import (
+    TIMEOUT_STATUS,
     normalize_scheduler_name,
     parse_scheduler_list,
     scheduler_output_filename,
@@ -73,14 +74,23 @@ def load_algorithm_results(
         path = (results_dir / filename).resolve()
         if not path.is_file():
             raise FileNotFoundError(f"Missing results file for {algo}: {path}")
+        df = pl.read_csv(path)
+        if "status" in df.columns:
+            df = df.filter(pl.col("status") != TIMEOUT_STATUS)
+        if "replicate" not in df.columns:
+            df = df.with_columns(pl.lit(0).alias("replicate"))
+        # Duplicate rows of a run keep their minimum; replicates are averaged, as
+        # in eval_utils.load_metric_values.
         df = (
-            pl.read_csv(path)
-            .select(
+            df.select(
                 "filename",
+                "replicate",
                 pl.col("total_cost").alias(f"total_cost_{algo}"),
             )
-            .group_by("filename")
+            .group_by("filename", "replicate")
             .agg(pl.col(f"total_cost_{algo}").min())
+            .group_by("filename")
+            .agg(pl.col(f"total_cost_{algo}").mean())
         )
         data.append(AlgorithmData(name=algo, path=path, df=df))
     return data
@@ -0,0 +1,167 @@
+"""
+Check the packing engine schedulers against their simulator counterparts.
+
+Every ``*_engine`` scheduler of ``packing_engine`` implements a scheduler of the
+simulator (``bfd_engine`` is ``bfd``, ``ffd_engine`` is ``ffd`` and so on). This
+script runs both on generated instances and fails unless they buy the same
+machines at the same total cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+
+import numpy as np
+
+from eval_utils import build_scheduler, parse_scheduler_list
+from packing_engine import ENGINE_SCHEDULERS
+from problem_generation import RESOURCE_COUNT, generate_dataset_instances
+
+ENGINE_SUFFIX = "_engine"
+
+
+def counterpart(engine_name: str) -> str:
+    """Name of the simulator scheduler that ``engine_name`` implements."""
+    return engine_name.removesuffix(ENGINE_SUFFIX)
+
+
+def check_packing_engine(
+    engine_names: list[str],
+    *,
+    num_instances: int,
+    J_range: tuple[int, int],
+    M_range: tuple[int, int],
+    T_range: tuple[int, int],
+    seed: int | None,
+    slot_workers: int = 1,
+    verbose: bool = False,
+) -> list[str]:
+    """
+    Run each engine scheduler and its counterpart on ``num_instances`` generated
+    instances and return a description of every mismatch.
+
+    Total costs match when they agree to a relative tolerance of 1e-9, since the
+    two implementations may sum the costs in a different order.
+    """
+
+    for name in engine_names:
+        if name not in ENGINE_SCHEDULERS:
+            raise ValueError(f"Unknown engine scheduler '{name}'.")
+    rng = np.random.default_rng(seed)
+    pairs = [
+        (
+            name,
+            build_scheduler(name, iterations=1, rng=rng, slot_workers=slot_workers),
+            build_scheduler(counterpart(name), iterations=1, rng=rng),
+        )
+        for name in engine_names
+    ]
+
+    mismatches: list[str] = []
+    instances = generate_dataset_instances(
+        num_instances,
+        K_range=(RESOURCE_COUNT, RESOURCE_COUNT),
+        J_range=J_range,
+        M_range=M_range,
+        T_range=T_range,
+        rng=rng,
+    )
+    for idx, dataset_instance in enumerate(instances):
+        problem = dataset_instance.instance
+        for name, engine_fn, simulator_fn in pairs:
+            engine = engine_fn(problem)
+            simulator = simulator_fn(problem)
+            engine_machines = np.asarray(engine.machine_vector, dtype=int)
+            simulator_machines = np.asarray(simulator.machine_vector, dtype=int)
+            same_machines = np.array_equal(engine_machines, simulator_machines)
+            same_cost = math.isclose(
+                engine.total_cost, simulator.total_cost, rel_tol=1e-9
+            )
+            if not (same_machines and same_cost):
+                mismatches.append(
+                    f"instance {idx} (J={dataset_instance.J}, M={dataset_instance.M}, "
+                    f"T={dataset_instance.T}): {name} bought {engine_machines} for "
+                    f"{engine.total_cost!r}, {counterpart(name)} bought "
+                    f"{simulator_machines} for {simulator.total_cost!r}"
+                )
+            elif verbose:
+                print(f"instance {idx}: {name} matches {counterpart(name)}")
+    return mismatches
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Check that the packing engine schedulers match their simulator "
+            "counterparts on generated instances."
+        )
+    )
+    parser.add_argument(
+        "--schedulers",
+        type=str,
+        default=",".join(ENGINE_SCHEDULERS),
+        help="Comma-separated engine schedulers (default: all of them).",
+    )
+    parser.add_argument(
+        "--num-instances",
+        dest="num_instances",
+        type=int,
+        default=20,
+        help="Number of generated instances.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generation seed.")
+    parser.add_argument("--J-min", dest="J_min", type=int, default=10)
+    parser.add_argument("--J-max", dest="J_max", type=int, default=15)
+    parser.add_argument("--M-min", dest="M_min", type=int, default=5)
+    parser.add_argument("--M-max", dest="M_max", type=int, default=10)
+    parser.add_argument("--T-min", dest="T_min", type=int, default=10)
+    parser.add_argument("--T-max", dest="T_max", type=int, default=50)
+    parser.add_argument(
+        "--slot-workers",
+        dest="slot_workers",
+        type=int,
+        default=1,
+        help="Pack the engine's time slots in N processes (0 = all CPU cores).",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print every matching pair as well (default: off).",
+    )
+    args = parser.parse_args()
+    if args.num_instances < 1:
+        parser.error("--num-instances must be positive.")
+    if args.slot_workers < 0:
+        parser.error("--slot-workers must be non-negative.")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    engine_names = parse_scheduler_list(args.schedulers)
+    if not engine_names:
+        raise SystemExit("No schedulers specified. Use --schedulers a,b,c.")
+
+    mismatches = check_packing_engine(
+        engine_names,
+        num_instances=args.num_instances,
+        J_range=(args.J_min, args.J_max),
+        M_range=(args.M_min, args.M_max),
+        T_range=(args.T_min, args.T_max),
+        seed=args.seed,
+        slot_workers=args.slot_workers,
+        verbose=args.verbose,
+    )
+    for mismatch in mismatches:
+        print(mismatch)
+    if mismatches:
+        raise SystemExit(f"{len(mismatches)} mismatch(es).")
+    print(
+        f"{len(engine_names)} engine scheduler(s) match their simulator "
+        f"counterparts on {args.num_instances} instance(s)."
+    )
+
+
+if __name__ == "__main__":
+    main()
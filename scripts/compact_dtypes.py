@@ -0,0 +1,47 @@
+"""
+Narrow stored arrays to the smallest dtype that represents them exactly.
+
+Generated instances hold small integers (capacities, demands, job counts) and a
+few float vectors, but NumPy defaults to int64/float64. ``compact_array`` picks the
+smallest integer type covering an array's range and the smallest float type that
+round-trips its values without loss. ``widen_array`` restores int64/float64 for
+schedulers that do arithmetic on the loaded arrays.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+FLOAT_CANDIDATES = (np.float16, np.float32)
+
+
+def compact_array(array: np.ndarray) -> np.ndarray:
+    """Return ``array`` cast to its smallest lossless dtype (or unchanged)."""
+    array = np.asarray(array)
+    if array.size == 0:
+        return array
+
+    if np.issubdtype(array.dtype, np.integer):
+        dtype = np.result_type(
+            np.min_scalar_type(int(array.min())), np.min_scalar_type(int(array.max()))
+        )
+        return array.astype(dtype, copy=False)
+
+    if np.issubdtype(array.dtype, np.floating):
+        for dtype in FLOAT_CANDIDATES:
+            if np.dtype(dtype).itemsize >= array.dtype.itemsize:
+                break
+            narrowed = array.astype(dtype)
+            if np.array_equal(narrowed.astype(array.dtype), array, equal_nan=True):
+                return narrowed
+    return array
+
+
+def widen_array(array: np.ndarray) -> np.ndarray:
+    """Return integer arrays as int64 and float arrays as float64."""
+    array = np.asarray(array)
+    if np.issubdtype(array.dtype, np.integer):
+        return array.astype(np.int64, copy=False)
+    if np.issubdtype(array.dtype, np.floating):
+        return array.astype(np.float64, copy=False)
+    return array
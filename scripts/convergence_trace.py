@@ -0,0 +1,101 @@
+"""
+Convergence traces of iterative schedulers.
+
+``eval.py --trace-convergence`` activates a ``ConvergenceTrace`` while a scheduler
+runs. Nothing is traced unless the scheduler reports its incumbents, in one of
+two ways:
+
+- call ``record_improvement(iteration, total_cost)`` for the initial schedule
+  (iteration 0) and for every schedule that becomes the incumbent. It is a no-op
+  when no trace is active, so the call can stay in the scheduler's loop;
+- or attach a ``convergence_trace`` sequence of ``(iteration, elapsed_sec, cost)``
+  to the returned schedule, for schedulers that cannot import this module.
+
+Only improvements are kept, so a trace is the incumbent cost as a step function
+of time. The simulator's iterative schedulers (ruin_recreate, ffd_with_repack) do
+not report incumbents yet; ``eval.py`` warns when a traced scheduler reported no
+points, and its ``trace_<name>.csv`` then has no rows for those runs.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+NS_PER_SEC = 1e9
+
+TRACE_FIELDNAMES = [
+    "filename",
+    "iterations",
+    "seed",
+    "replicate",
+    "iteration",
+    "elapsed_sec",
+    "cost",
+]
+
+_active_trace: ContextVar[ConvergenceTrace | None] = ContextVar(
+    "active_convergence_trace", default=None
+)
+
+
+@dataclass(frozen=True)
+class TracePoint:
+    iteration: int
+    elapsed_sec: float
+    cost: float
+
+
+class ConvergenceTrace:
+    """Incumbent costs of one run, timed from the last ``restart``."""
+
+    def __init__(self) -> None:
+        self._points: list[TracePoint] = []
+        self._start_ns = time.perf_counter_ns()
+
+    def restart(self) -> None:
+        self._points.clear()
+        self._start_ns = time.perf_counter_ns()
+
+    def record(self, iteration: int, cost: float) -> None:
+        """Record ``cost`` at ``iteration`` if it improves on the incumbent."""
+        elapsed_ns = time.perf_counter_ns() - self._start_ns
+        if self._points and cost >= self._points[-1].cost:
+            return
+        self._points.append(
+            TracePoint(int(iteration), elapsed_ns / NS_PER_SEC, float(cost))
+        )
+
+    def points(self) -> tuple[TracePoint, ...]:
+        return tuple(self._points)
+
+    @contextmanager
+    def activate(self) -> Iterator[ConvergenceTrace]:
+        """Make this trace the target of ``record_improvement`` in this context."""
+        token = _active_trace.set(self)
+        try:
+            yield self
+        finally:
+            _active_trace.reset(token)
+
+
+def record_improvement(iteration: int, cost: float) -> None:
+    """Report a new incumbent ``cost`` to the active trace, if any."""
+    trace = _active_trace.get()
+    if trace is not None:
+        trace.record(iteration, cost)
+
+
+def improvements(
+    points: Iterable[tuple[int, float, float]],
+) -> tuple[TracePoint, ...]:
+    """Keep the strictly improving points of ``(iteration, elapsed_sec, cost)``."""
+    kept: list[TracePoint] = []
+    for iteration, elapsed_sec, cost in points:
+        if kept and cost >= kept[-1].cost:
+            continue
+        kept.append(TracePoint(int(iteration), float(elapsed_sec), float(cost)))
+    return tuple(kept)
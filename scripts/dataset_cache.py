@@ -0,0 +1,164 @@
+"""
+Content-addressed cache for generated datasets.
+
+A dataset is keyed by a SHA-256 hash of its canonicalized generation parameters
+(including the seed) and of the source code of the generator modules. Each cache
+entry is a directory ``<cache_dir>/<key>/`` holding the generated files and a
+``manifest.json`` with the parameters and a SHA-256 hash per file. On a hit the
+files are verified against the manifest and hard-linked (or, across file systems,
+symlinked) into the requested output directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Callable, Iterable, Mapping
+from pathlib import Path
+
+MANIFEST_NAME = "manifest.json"
+HASH_CHUNK_BYTES = 1 << 20
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+GENERATOR_SOURCES = (
+    "generate_dataset.py",
+    "problem_generation.py",
+    "packed_dataset.py",
+    "sparse_job_counts.py",
+    "compact_dtypes.py",
+)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generator_code_version(
+    sources: Iterable[str | Path] = GENERATOR_SOURCES,
+) -> str:
+    """Hash the generator source files so that code changes invalidate the cache."""
+    digest = hashlib.sha256()
+    for source in sources:
+        path = SCRIPTS_DIR / source
+        digest.update(path.name.encode())
+        digest.update(file_sha256(path).encode())
+    return digest.hexdigest()
+
+
+def cache_key(parameters: Mapping[str, object], code_version: str) -> str:
+    canonical = json.dumps(
+        {"parameters": dict(parameters), "code_version": code_version},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _dataset_files(dataset_dir: Path) -> list[Path]:
+    return sorted(
+        path.relative_to(dataset_dir)
+        for path in dataset_dir.rglob("*")
+        if path.is_file() and path.name != MANIFEST_NAME
+    )
+
+
+def verify_entry(entry_dir: Path) -> bool:
+    """Return True when every file listed in the manifest exists with its hash."""
+    manifest_path = entry_dir / MANIFEST_NAME
+    if not manifest_path.is_file():
+        return False
+    manifest = json.loads(manifest_path.read_text())
+    for relative, expected in manifest["files"].items():
+        path = entry_dir / relative
+        if not path.is_file() or file_sha256(path) != expected:
+            return False
+    return True
+
+
+def link_dataset(entry_dir: Path, output_dir: Path) -> list[Path]:
+    """Hard-link (or symlink) every cached file of ``entry_dir`` into ``output_dir``."""
+    manifest = json.loads((entry_dir / MANIFEST_NAME).read_text())
+    linked: list[Path] = []
+    for relative in manifest["files"]:
+        source = entry_dir / relative
+        target = output_dir / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.is_symlink() or target.exists():
+            target.unlink()
+        try:
+            os.link(source, target)
+        except OSError:
+            target.symlink_to(source.resolve())
+        linked.append(target)
+    return linked
+
+
+def unshare_file(path: Path) -> None:
+    """Replace a hard- or symlinked file by a private copy before modifying it."""
+    if not path.is_symlink() and (not path.exists() or path.stat().st_nlink <= 1):
+        return
+    private = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    shutil.copyfile(path.resolve(), private)
+    os.replace(private, path)
+
+
+def cached_dataset(
+    cache_dir: Path,
+    parameters: Mapping[str, object],
+    build: Callable[[Path], object],
+    *,
+    code_version: str | None = None,
+) -> tuple[Path, bool]:
+    """
+    Return the cache entry for ``parameters``, building it with ``build`` on a miss.
+
+    ``build`` receives an empty directory to generate the dataset into. Entries that
+    fail verification are discarded and rebuilt. Returns ``(entry_dir, hit)``.
+    """
+
+    code_version = code_version or generator_code_version()
+    key = cache_key(parameters, code_version)
+    entry_dir = cache_dir / key
+
+    if entry_dir.is_dir():
+        if verify_entry(entry_dir):
+            return entry_dir, True
+        shutil.rmtree(entry_dir)
+
+    staging_dir = cache_dir / f".{key}.{os.getpid()}.tmp"
+    if staging_dir.exists():
+        shutil.rmtree(staging_dir)
+    staging_dir.mkdir(parents=True)
+    try:
+        build(staging_dir)
+        manifest = {
+            "key": key,
+            "code_version": code_version,
+            "parameters": dict(parameters),
+            "files": {
+                path.as_posix(): file_sha256(staging_dir / path)
+                for path in _dataset_files(staging_dir)
+            },
+        }
+        (staging_dir / MANIFEST_NAME).write_text(
+            json.dumps(manifest, indent=2, sort_keys=True, default=str) + "\n"
+        )
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    try:
+        staging_dir.rename(entry_dir)
+    except OSError:
+        # Another run stored the same entry first; keep theirs.
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        if not verify_entry(entry_dir):
+            raise
+    return entry_dir, False
@@ -2,21 +2,84 @@ from __future__ import annotations
 
 import argparse
 import csv
+import math
+import multiprocessing
+import os
 import time
-from collections.abc import Callable, Iterable
-from dataclasses import dataclass
+import warnings
+from collections.abc import Callable, Container, Iterable, Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from functools import cache, partial
 from pathlib import Path
+from typing import Literal, TextIO
 
 import numpy as np
 
 from simulator.algorithms import ScheduleResult
 from simulator.problem import ProblemInstance
 from eval_utils import (
+    ITERATIVE_SCHEDULERS,
+    TIMEOUT_STATUS,
     build_scheduler,
     normalize_scheduler_name,
     parse_scheduler_list,
     scheduler_output_filename,
+    replicate_summary_filename,
+    supports_time_budget,
+    trace_output_filename,
 )
+from compact_dtypes import widen_array
+from convergence_trace import (
+    TRACE_FIELDNAMES,
+    ConvergenceTrace,
+    TracePoint,
+    improvements,
+)
+from packed_dataset import PackedDataset, is_packed_dataset
+from packing_engine import close_slot_pools
+from memory_tracing import MemoryUsage, measure_memory
+from phase_timing import NS_PER_SEC, PhaseTimer, format_phases
+from result_cache import CachedSchedule, ResultCache
+from runtime_measurement import RuntimeMeasurement, TimingConfig, measure
+from sparse_job_counts import SPARSE_JOB_COUNT_KEYS, SparseJobCounts
+
+DatasetLayout = Literal["auto", "npz", "packed"]
+EvaluationOrder = Literal["scheduler", "instance"]
+DEFAULT_TIMING = TimingConfig()
+RunStatus = Literal["ok", "timeout"]
+
+RESULT_FIELDNAMES = [
+    "filename",
+    "K",
+    "J",
+    "M",
+    "T",
+    "total_cost",
+    "total_machines",
+    "runtime_sec",
+    "machine_vector",
+    "iterations",
+    "seed",
+    "replicate",
+    "runtime_min_sec",
+    "runtime_median_sec",
+    "runtime_ci_low_sec",
+    "runtime_ci_high_sec",
+    "cpu_time_sec",
+    "runtime_repeats",
+    "load_sec",
+    "validate_sec",
+    "scheduler_phases",
+    "peak_traced_bytes",
+    "rss_delta_bytes",
+    "status",
+    "time_budget_sec",
+    "cached",
+]
+PHASE_SUMMARY_NAME = "phase_summary.csv"
+# Columns identifying a (scheduler, instance) run in a results CSV.
+RESUME_KEY_FIELDS = ("filename", "iterations", "seed", "replicate")
 
 
 @dataclass
@@ -24,48 +87,126 @@ class InstanceResult:
     filename: str
     total_cost: float
     machine_vector: np.ndarray
-    runtime_sec: float
+    timing: RuntimeMeasurement
+    load_sec: float = 0.0
+    validate_sec: float = 0.0
+    # Internal scheduler phases (name -> seconds) of the last timed run.
+    phases: dict[str, float] = field(default_factory=dict)
+    memory: MemoryUsage | None = None
+    # "timeout": the run was killed at its time budget and has no schedule.
+    status: RunStatus = "ok"
+    # Incumbent costs of the last timed run, with --trace-convergence.
+    convergence: tuple[TracePoint, ...] = ()
+    # Index of this independently seeded run of the scheduler on the instance.
+    replicate: int = 0
+    # Taken from the result cache; the timings are those of the original run.
+    cached: bool = False
+
+    @property
+    def runtime_sec(self) -> float:
+        return self.timing.median_sec
 
     @property
     def total_machines(self) -> int:
         return int(np.sum(self.machine_vector))
 
 
-def _load_problem(npz_path: Path) -> ProblemInstance:
-    """Load a problem instance stored by ``generate_dataset``."""
+@dataclass(frozen=True)
+class RunConfig:
+    """Settings shared by every (scheduler, instance) run of an evaluation."""
+
+    iterations: int
+    validate: bool
+    timing: TimingConfig = DEFAULT_TIMING
+    trace_memory: bool = False
+    # Wall-clock seconds per scheduler run; None means unlimited.
+    time_budget: float | None = None
+    trace_convergence: bool = False
+    result_cache: ResultCache | None = None
+    # Processes per run of the packing engine schedulers (see build_scheduler).
+    slot_workers: int = 1
+
+
+def _load_job_counts(data: Mapping[str, np.ndarray]) -> np.ndarray | SparseJobCounts:
+    if "job_counts" in data:
+        return data["job_counts"]
+    return SparseJobCounts.from_arrays(
+        data, num_jobs=int(np.asarray(data["requirements"]).shape[1])
+    )
+
+
+def _load_problem(npz_path: Path, *, widen: bool = True) -> ProblemInstance:
+    """
+    Load a problem instance stored by ``generate_dataset``.
+
+    Sparse job counts are densified, since the simulator schedulers expect the
+    dense (T, J) matrix. With ``widen`` (the default), arrays stored with compact
+    dtypes are cast back to int64/float64 before they reach a scheduler.
+    """
 
     with np.load(npz_path) as data:
         required_keys = [
             "capacities",
             "requirements",
-            "job_counts",
             "purchase_costs",
             "running_costs",
             "resource_weights",
         ]
+        if "job_counts" not in data:
+            required_keys.extend(SPARSE_JOB_COUNT_KEYS)
         missing = [key for key in required_keys if key not in data]
         if missing:
             raise ValueError(f"{npz_path} is missing required keys: {missing}")
 
-        return ProblemInstance(
-            capacities=data["capacities"],
-            requirements=data["requirements"],
-            job_counts=data["job_counts"],
-            purchase_costs=data["purchase_costs"],
-            running_costs=data["running_costs"],
-            resource_weights=data["resource_weights"],
-        )
+        job_counts = _load_job_counts(data)
+        if isinstance(job_counts, SparseJobCounts):
+            job_counts = job_counts.to_dense()
+
+        arrays = {
+            "capacities": data["capacities"],
+            "requirements": data["requirements"],
+            "job_counts": job_counts,
+            "purchase_costs": data["purchase_costs"],
+            "running_costs": data["running_costs"],
+            "resource_weights": data["resource_weights"],
+        }
+        if widen:
+            arrays = {key: widen_array(value) for key, value in arrays.items()}
+
+        return ProblemInstance(**arrays)
+
+
+def _problem_loader(
+    dataset_dir: Path, layout: DatasetLayout
+) -> Callable[[Path], ProblemInstance]:
+    """Return a loader for instance paths of ``dataset_dir`` in the given layout."""
+
+    if layout == "npz" or (layout == "auto" and not is_packed_dataset(dataset_dir)):
+        return _load_problem
+
+    packed = PackedDataset(dataset_dir)
+    return lambda path: packed.load(path.name)
+
+
+@cache
+def _cached_problem_loader(
+    dataset_dir: Path, layout: DatasetLayout
+) -> Callable[[Path], ProblemInstance]:
+    # Worker processes open (and memory-map) each dataset only once.
+    return _problem_loader(dataset_dir, layout)
 
 
 def _npz_dimensions(npz_path: Path) -> dict[str, int]:
     with np.load(npz_path) as data:
         capacities = np.asarray(data["capacities"])
         requirements = np.asarray(data["requirements"])
-        job_counts = np.asarray(data["job_counts"])
 
         K, M = capacities.shape
         _, J = requirements.shape
-        T = int(np.atleast_2d(job_counts).shape[0])
+        if "job_counts" in data:
+            T = int(np.atleast_2d(np.asarray(data["job_counts"])).shape[0])
+        else:
+            T = int(np.asarray(data["job_counts_indptr"]).size - 1)
 
         return {"K": int(K), "J": int(J), "M": int(M), "T": T}
 
@@ -90,23 +231,832 @@ def run_on_instance(
     scheduler_fn: Callable[[ProblemInstance], ScheduleResult],
     *,
     validate: bool,
+    load_problem: Callable[[Path], ProblemInstance] = _load_problem,
+    timing: TimingConfig = DEFAULT_TIMING,
+    trace_memory: bool = False,
+    trace_convergence: bool = False,
+    rng: np.random.Generator | None = None,
+) -> InstanceResult:
+    problem, load_sec = _timed_load(load_problem, npz_path)
+    result = run_on_problem(
+        problem,
+        npz_path.name,
+        scheduler_fn,
+        validate=validate,
+        timing=timing,
+        trace_memory=trace_memory,
+        trace_convergence=trace_convergence,
+        rng=rng,
+    )
+    return replace(result, load_sec=load_sec)
+
+
+def _timed_load(
+    load_problem: Callable[[Path], ProblemInstance], npz_path: Path
+) -> tuple[ProblemInstance, float]:
+    start = time.perf_counter_ns()
+    problem = load_problem(npz_path)
+    return problem, (time.perf_counter_ns() - start) / NS_PER_SEC
+
+
+def run_on_problem(
+    problem: ProblemInstance,
+    filename: str,
+    scheduler_fn: Callable[[ProblemInstance], ScheduleResult],
+    *,
+    validate: bool,
+    timing: TimingConfig = DEFAULT_TIMING,
+    trace_memory: bool = False,
+    trace_convergence: bool = False,
+    rng: np.random.Generator | None = None,
 ) -> InstanceResult:
-    problem = _load_problem(npz_path)
+    """
+    Run and time ``scheduler_fn`` on ``problem``.
+
+    When ``timing`` asks for warmup or repeated runs and ``rng`` is the scheduler's
+    RNG, its state is restored before every run. All runs then compute the same
+    schedule, and the RNG ends where a single run would leave it.
+
+    Scheduler phases reported through ``phase_timing.phase`` (or a ``phase_times``
+    mapping on the returned schedule) are recorded for the last timed run. With
+    ``trace_convergence`` so are the incumbent costs reported through
+    ``convergence_trace.record_improvement`` (or a ``convergence_trace`` sequence on
+    the returned schedule).
 
-    start = time.monotonic()
-    schedule = scheduler_fn(problem)
-    runtime_sec = time.monotonic() - start
+    With ``trace_memory`` the scheduler runs once more, untimed, under
+    ``memory_tracing.measure_memory`` to record its peak memory usage.
+    """
 
+    rng_state = None
+    if rng is not None and (timing.warmup or timing.max_repeats > 1 or trace_memory):
+        rng_state = rng.bit_generator.state
+    phase_timer = PhaseTimer()
+    trace = ConvergenceTrace()
+
+    def reset() -> None:
+        phase_timer.clear()
+        if rng_state is not None:
+            rng.bit_generator.state = rng_state
+        trace.restart()
+
+    def run() -> ScheduleResult:
+        if not trace_convergence:
+            return scheduler_fn(problem)
+        with trace.activate():
+            return scheduler_fn(problem)
+
+    with phase_timer.activate():
+        schedule, measurement = measure(run, timing=timing, reset=reset)
+    phases = phase_timer.seconds()
+    phases.update(getattr(schedule, "phase_times", None) or {})
+    convergence = ()
+    if trace_convergence:
+        convergence = trace.points() or improvements(
+            getattr(schedule, "convergence_trace", None) or ()
+        )
+
+    memory = None
+    if trace_memory:
+        reset()
+        schedule, memory = measure_memory(lambda: scheduler_fn(problem))
+
+    validate_sec = 0.0
     if validate:
+        start = time.perf_counter_ns()
         schedule.validate(problem)
+        validate_sec = (time.perf_counter_ns() - start) / NS_PER_SEC
 
     return InstanceResult(
-        filename=npz_path.name,
+        filename=filename,
         total_cost=float(schedule.total_cost),
         machine_vector=np.asarray(schedule.machine_vector, dtype=int),
-        runtime_sec=runtime_sec,
+        timing=measurement,
+        validate_sec=validate_sec,
+        phases=phases,
+        memory=memory,
+        convergence=convergence,
+    )
+
+
+def _scheduler_seed(seed: int | None, scheduler_idx: int) -> int | None:
+    return None if seed is None else seed + scheduler_idx
+
+
+def instance_seed_sequence(
+    seed: int | None, scheduler_idx: int, instance_idx: int, replicate: int = 0
+) -> np.random.SeedSequence:
+    """
+    Seed for replicate ``replicate`` of scheduler ``scheduler_idx`` on instance
+    ``instance_idx``.
+
+    The seed only depends on the indices, so results do not depend on the number
+    of workers or the order in which tasks complete. Replicate 0 keeps the seed of
+    a single-replicate evaluation.
+    """
+
+    spawn_key = (instance_idx,) if replicate == 0 else (instance_idx, replicate)
+    return np.random.SeedSequence(
+        _scheduler_seed(seed, scheduler_idx), spawn_key=spawn_key
+    )
+
+
+@dataclass(frozen=True)
+class EvaluationTask:
+    """(scheduler, replicate) runs, each with its own seed, on one loaded instance."""
+
+    npz_path: Path
+    runs: tuple[tuple[str, int, np.random.SeedSequence], ...]
+
+
+def _run_scheduler(
+    problem: ProblemInstance,
+    filename: str,
+    scheduler_name: str,
+    scheduler_fn: Callable[[ProblemInstance], ScheduleResult],
+    rng: np.random.Generator,
+    config: RunConfig,
+) -> InstanceResult:
+    """
+    Run one scheduler on a loaded instance under ``config``.
+
+    Schedulers that honour ``time_budget`` themselves (see ``supports_time_budget``)
+    run in-process and return their best schedule when time runs out. Any other
+    scheduler runs in a child process that is killed at the budget.
+
+    With a result cache, a stored result for the same problem, scheduler settings
+    and RNG state is returned instead of running the scheduler, unless the run
+    traces memory or convergence, or needs validation the entry did not get.
+    Finished runs are stored; timeouts are not.
+    """
+
+    cache = config.result_cache
+    key = None
+    if cache is not None:
+        key = cache.key(
+            problem,
+            scheduler_name=scheduler_name,
+            iterations=config.iterations,
+            time_budget=config.time_budget,
+            rng_state=rng.bit_generator.state,
+            timing=asdict(config.timing),
+            slot_workers=config.slot_workers,
+        )
+        if not (config.trace_memory or config.trace_convergence):
+            entry = cache.load(key)
+            if entry is not None and (entry.validated or not config.validate):
+                rng.bit_generator.state = entry.rng_state
+                return _cached_result(filename, entry)
+
+    if config.time_budget is None or supports_time_budget(scheduler_name):
+        result = run_on_problem(
+            problem,
+            filename,
+            scheduler_fn,
+            validate=config.validate,
+            timing=config.timing,
+            trace_memory=config.trace_memory,
+            trace_convergence=config.trace_convergence,
+            rng=rng,
+        )
+    else:
+        result = _run_with_hard_timeout(problem, filename, scheduler_name, rng, config)
+
+    if key is not None and result.status != TIMEOUT_STATUS:
+        cache.store(
+            key,
+            CachedSchedule(
+                total_cost=result.total_cost,
+                machine_vector=result.machine_vector.tolist(),
+                wall_ns=list(result.timing.wall_ns),
+                cpu_ns=list(result.timing.cpu_ns),
+                confidence=result.timing.confidence,
+                validated=config.validate,
+                rng_state=rng.bit_generator.state,
+                phases=result.phases,
+            ),
+        )
+    return result
+
+
+def _cached_result(filename: str, entry: CachedSchedule) -> InstanceResult:
+    return InstanceResult(
+        filename=filename,
+        total_cost=entry.total_cost,
+        machine_vector=np.asarray(entry.machine_vector, dtype=int),
+        timing=RuntimeMeasurement(
+            wall_ns=tuple(entry.wall_ns),
+            cpu_ns=tuple(entry.cpu_ns),
+            confidence=entry.confidence,
+        ),
+        phases=dict(entry.phases),
+        cached=True,
+    )
+
+
+def _budgeted_child(
+    connection,
+    problem: ProblemInstance,
+    filename: str,
+    scheduler_name: str,
+    rng_state: dict,
+    config: RunConfig,
+) -> None:
+    try:
+        rng = np.random.default_rng()
+        rng.bit_generator.state = rng_state
+        scheduler_fn = build_scheduler(
+            scheduler_name,
+            iterations=config.iterations,
+            rng=rng,
+            slot_workers=config.slot_workers,
+        )
+
+        def budgeted_fn(problem: ProblemInstance) -> ScheduleResult:
+            # The parent times each scheduler call between these messages.
+            connection.send(("started", None))
+            schedule = scheduler_fn(problem)
+            connection.send(("finished", None))
+            return schedule
+
+        result = run_on_problem(
+            problem,
+            filename,
+            budgeted_fn,
+            validate=config.validate,
+            timing=config.timing,
+            trace_memory=config.trace_memory,
+            trace_convergence=config.trace_convergence,
+            rng=rng,
+        )
+        connection.send(("ok", (result, rng.bit_generator.state)))
+    except Exception as exc:
+        connection.send(("error", exc))
+    finally:
+        # The child exits without running atexit handlers.
+        close_slot_pools()
+        connection.close()
+
+
+def _run_with_hard_timeout(
+    problem: ProblemInstance,
+    filename: str,
+    scheduler_name: str,
+    rng: np.random.Generator,
+    config: RunConfig,
+) -> InstanceResult:
+    """
+    Run the scheduler in a child process and kill it when its budget runs out.
+
+    The budget applies to each warmup, timed and traced run separately: the child
+    reports when every scheduler call starts and finishes, and is killed once a
+    call runs longer than the budget. On success ``rng`` continues from the
+    child's final state, as after an in-process run. On a timeout ``rng`` is left
+    unchanged and the result has status ``"timeout"``.
+    """
+
+    assert config.time_budget is not None
+
+    context = multiprocessing.get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_budgeted_child,
+        args=(
+            sender,
+            problem,
+            filename,
+            scheduler_name,
+            rng.bit_generator.state,
+            config,
+        ),
+    )
+    process.start()
+    sender.close()
+    try:
+        message, payload = receiver.recv()
+        while message in ("started", "finished"):
+            if message == "started":
+                start = time.perf_counter_ns()
+                if not receiver.poll(config.time_budget):
+                    elapsed_ns = time.perf_counter_ns() - start
+                    process.kill()
+                    return InstanceResult(
+                        filename=filename,
+                        total_cost=math.nan,
+                        machine_vector=np.zeros(0, dtype=int),
+                        timing=RuntimeMeasurement(wall_ns=(elapsed_ns,), cpu_ns=(0,)),
+                        status=TIMEOUT_STATUS,
+                    )
+            message, payload = receiver.recv()
+    except EOFError:
+        raise RuntimeError(
+            f"{scheduler_name} on {filename} exited without a result "
+            f"(exit code {process.exitcode})."
+        ) from None
+    finally:
+        process.join()
+        receiver.close()
+
+    if message == "error":
+        raise payload
+    result, rng_state = payload
+    rng.bit_generator.state = rng_state
+    return result
+
+
+def _run_task(
+    task: EvaluationTask,
+    *,
+    dataset_dir: Path,
+    layout: DatasetLayout,
+    config: RunConfig,
+) -> list[InstanceResult]:
+    problem, load_sec = _timed_load(
+        _cached_problem_loader(dataset_dir, layout), task.npz_path
+    )
+    results: list[InstanceResult] = []
+    for scheduler_name, replicate, seed_sequence in task.runs:
+        rng = np.random.default_rng(seed_sequence)
+        scheduler_fn = build_scheduler(
+            scheduler_name,
+            iterations=config.iterations,
+            rng=rng,
+            time_budget=config.time_budget,
+            slot_workers=config.slot_workers,
+        )
+        result = _run_scheduler(
+            problem, task.npz_path.name, scheduler_name, scheduler_fn, rng, config
+        )
+        # The instance is loaded once; every scheduler run reports that load.
+        results.append(replace(result, load_sec=load_sec, replicate=replicate))
+    return results
+
+
+def _serial_results(
+    entries: list[tuple[Path, dict[str, int]]],
+    scheduler_names: list[str],
+    *,
+    seed: int | None,
+    load_problem: Callable[[Path], ProblemInstance],
+    order: EvaluationOrder,
+    config: RunConfig,
+    completed: Container[tuple[str, str, int]] = frozenset(),
+) -> Iterator[tuple[str, dict[str, int], InstanceResult]]:
+    # One RNG per scheduler, shared by all instances in dataset order. Each RNG is
+    # only used by its scheduler, so both orders give the same results.
+    rngs = {
+        scheduler_name: np.random.default_rng(_scheduler_seed(seed, idx))
+        for idx, scheduler_name in enumerate(scheduler_names)
+    }
+    scheduler_fns = {
+        scheduler_name: build_scheduler(
+            scheduler_name,
+            iterations=config.iterations,
+            rng=rng,
+            time_budget=config.time_budget,
+            slot_workers=config.slot_workers,
+        )
+        for scheduler_name, rng in rngs.items()
+    }
+
+    if order == "scheduler":
+        for scheduler_name, scheduler_fn in scheduler_fns.items():
+            for npz_path, dims in entries:
+                if (scheduler_name, npz_path.name, 0) in completed:
+                    continue
+                problem, load_sec = _timed_load(load_problem, npz_path)
+                result = _run_scheduler(
+                    problem,
+                    npz_path.name,
+                    scheduler_name,
+                    scheduler_fn,
+                    rngs[scheduler_name],
+                    config,
+                )
+                yield scheduler_name, dims, replace(result, load_sec=load_sec)
+        return
+
+    for npz_path, dims in entries:
+        pending = [
+            (scheduler_name, scheduler_fn)
+            for scheduler_name, scheduler_fn in scheduler_fns.items()
+            if (scheduler_name, npz_path.name, 0) not in completed
+        ]
+        if not pending:
+            continue
+        problem, load_sec = _timed_load(load_problem, npz_path)
+        for scheduler_name, scheduler_fn in pending:
+            result = _run_scheduler(
+                problem,
+                npz_path.name,
+                scheduler_name,
+                scheduler_fn,
+                rngs[scheduler_name],
+                config,
+            )
+            yield scheduler_name, dims, replace(result, load_sec=load_sec)
+
+
+def _parallel_results(
+    entries: list[tuple[Path, dict[str, int]]],
+    scheduler_names: list[str],
+    *,
+    dataset_dir: Path,
+    layout: DatasetLayout,
+    seed: int | None,
+    workers: int,
+    order: EvaluationOrder,
+    config: RunConfig,
+    completed: Container[tuple[str, str, int]] = frozenset(),
+    replicates: int = 1,
+) -> Iterator[tuple[str, dict[str, int], InstanceResult]]:
+    def run_spec(scheduler_idx: int, instance_idx: int, replicate: int):
+        seed_sequence = instance_seed_sequence(
+            seed, scheduler_idx, instance_idx, replicate
+        )
+        return scheduler_names[scheduler_idx], replicate, seed_sequence
+
+    # A task is one instance with the (scheduler, replicate) runs to do on it. In
+    # scheduler order every run is its own task, so replicates run in parallel.
+    if order == "scheduler":
+        task_keys = [
+            (instance_idx, ((scheduler_idx, replicate),))
+            for scheduler_idx in range(len(scheduler_names))
+            for instance_idx in range(len(entries))
+            for replicate in range(replicates)
+        ]
+    else:
+        all_runs = tuple(
+            (scheduler_idx, replicate)
+            for scheduler_idx in range(len(scheduler_names))
+            for replicate in range(replicates)
+        )
+        task_keys = [(instance_idx, all_runs) for instance_idx in range(len(entries))]
+    task_keys = [
+        (instance_idx, pending)
+        for instance_idx, run_indices in task_keys
+        if (
+            pending := tuple(
+                (scheduler_idx, replicate)
+                for scheduler_idx, replicate in run_indices
+                if (
+                    scheduler_names[scheduler_idx],
+                    entries[instance_idx][0].name,
+                    replicate,
+                )
+                not in completed
+            )
+        )
+    ]
+    tasks = [
+        EvaluationTask(
+            npz_path=entries[instance_idx][0],
+            runs=tuple(
+                run_spec(scheduler_idx, instance_idx, replicate)
+                for scheduler_idx, replicate in run_indices
+            ),
+        )
+        for instance_idx, run_indices in task_keys
+    ]
+    run = partial(
+        _run_task,
+        dataset_dir=dataset_dir,
+        layout=layout,
+        config=config,
     )
 
+    def flatten(task_results: Iterable[list[InstanceResult]]):
+        for task, (instance_idx, _), results in zip(tasks, task_keys, task_results):
+            dims = entries[instance_idx][1]
+            for (scheduler_name, _, _), result in zip(task.runs, results):
+                yield scheduler_name, dims, result
+
+    if workers == 1:
+        yield from flatten(map(run, tasks))
+        return
+
+    max_workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (4 * max_workers))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # ``map`` returns results in task order, whatever the completion order.
+        yield from flatten(executor.map(run, tasks, chunksize=chunksize))
+
+
+def _result_row(
+    result: InstanceResult,
+    dims: Mapping[str, int],
+    *,
+    config: RunConfig,
+    seed: int | None,
+) -> dict[str, object]:
+    ci_low, ci_high = result.timing.ci_sec()
+    memory = result.memory
+    timed_out = result.status == TIMEOUT_STATUS
+    row = {
+        "filename": result.filename,
+        "K": dims["K"],
+        "J": dims["J"],
+        "M": dims["M"],
+        "T": dims["T"],
+        "total_cost": result.total_cost,
+        "total_machines": result.total_machines,
+        "runtime_sec": result.runtime_sec,
+        "machine_vector": " ".join(map(str, result.machine_vector.tolist())),
+        "iterations": config.iterations,
+        "seed": "" if seed is None else seed,
+        "replicate": result.replicate,
+        "runtime_min_sec": result.timing.min_sec,
+        "runtime_median_sec": result.timing.median_sec,
+        "runtime_ci_low_sec": _format_optional(ci_low),
+        "runtime_ci_high_sec": _format_optional(ci_high),
+        "cpu_time_sec": result.timing.cpu_median_sec,
+        "runtime_repeats": result.timing.repeats,
+        "load_sec": result.load_sec,
+        "validate_sec": result.validate_sec,
+        "scheduler_phases": format_phases(result.phases),
+        "peak_traced_bytes": "" if memory is None else memory.peak_traced_bytes,
+        "rss_delta_bytes": "" if memory is None else memory.rss_delta_bytes,
+        "status": result.status,
+        "time_budget_sec": "" if config.time_budget is None else config.time_budget,
+        "cached": int(result.cached),
+    }
+    if timed_out:
+        # Killed runs have no schedule; runtime_sec is the time until the kill.
+        for column in (
+            "total_cost",
+            "total_machines",
+            "machine_vector",
+            "cpu_time_sec",
+        ):
+            row[column] = ""
+    return row
+
+
+def _format_optional(value: float) -> float | str:
+    return "" if math.isnan(value) else value
+
+
+class ResultsWriter:
+    """
+    Append result rows to the per-scheduler ``eval_<name>.csv`` files.
+
+    Every row is flushed and fsync'd as soon as it is written, so an interrupted
+    evaluation keeps all finished rows. Without ``resume`` existing files are
+    truncated. With ``resume`` they are kept, and ``completed`` reports the runs
+    they already contain.
+
+    With ``traces`` the convergence trace of every run is written to
+    ``trace_<name>.csv``, before the run's result row. On resume, trace rows of
+    runs without a result row are dropped, since those runs are repeated.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        scheduler_names: Iterable[str],
+        *,
+        resume: bool,
+        traces: bool = False,
+    ) -> None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self._existing: dict[str, set[tuple[str, ...]]] = {}
+        self._handles = []
+        self._writers: dict[str, tuple[TextIO, csv.DictWriter]] = {}
+        self._trace_writers: dict[str, tuple[TextIO, csv.DictWriter]] = {}
+        try:
+            for scheduler_name in scheduler_names:
+                csv_path = output_dir / scheduler_output_filename(scheduler_name)
+                self._existing[scheduler_name] = (
+                    _read_resume_keys(csv_path) if resume else set()
+                )
+                self._writers[scheduler_name] = self._open(
+                    csv_path, RESULT_FIELDNAMES, resume=resume
+                )
+                if traces:
+                    trace_path = output_dir / trace_output_filename(scheduler_name)
+                    if resume:
+                        _keep_trace_rows(trace_path, self._existing[scheduler_name])
+                    self._trace_writers[scheduler_name] = self._open(
+                        trace_path, TRACE_FIELDNAMES, resume=resume
+                    )
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(
+        self, csv_path: Path, fieldnames: list[str], *, resume: bool
+    ) -> tuple[TextIO, csv.DictWriter]:
+        write_header = not (
+            resume and csv_path.is_file() and csv_path.stat().st_size > 0
+        )
+        handle = csv_path.open("w" if write_header else "a", newline="")
+        self._handles.append(handle)
+        writer = csv.DictWriter(handle, fieldnames=fieldnames)
+        if write_header:
+            writer.writeheader()
+            self._sync(handle)
+        return handle, writer
+
+    def completed(
+        self, *, iterations: int, seed: int | None
+    ) -> set[tuple[str, str, int]]:
+        """(scheduler, filename, replicate) runs already stored for these settings."""
+        seed_value = "" if seed is None else str(seed)
+        return {
+            (scheduler_name, filename, int(replicate))
+            for scheduler_name, keys in self._existing.items()
+            for filename, row_iterations, row_seed, replicate in keys
+            if row_iterations == str(iterations) and row_seed == seed_value
+        }
+
+    def write(
+        self,
+        scheduler_name: str,
+        row: Mapping[str, object],
+        trace: Iterable[TracePoint] = (),
+    ) -> float:
+        """Write and sync one row and its trace; returns the seconds this took."""
+        start = time.perf_counter_ns()
+        if scheduler_name in self._trace_writers:
+            trace_handle, trace_writer = self._trace_writers[scheduler_name]
+            run_key = {field: row[field] for field in RESUME_KEY_FIELDS}
+            trace_writer.writerows(
+                {
+                    **run_key,
+                    "iteration": point.iteration,
+                    "elapsed_sec": point.elapsed_sec,
+                    "cost": point.cost,
+                }
+                for point in trace
+            )
+            self._sync(trace_handle)
+        handle, writer = self._writers[scheduler_name]
+        writer.writerow(row)
+        self._sync(handle)
+        return (time.perf_counter_ns() - start) / NS_PER_SEC
+
+    @staticmethod
+    def _sync(handle) -> None:
+        handle.flush()
+        os.fsync(handle.fileno())
+
+    def close(self) -> None:
+        for handle in self._handles:
+            handle.close()
+        self._handles.clear()
+
+    def __enter__(self) -> ResultsWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _drop_partial_row(csv_path: Path) -> None:
+    # Rows are synced whole, so only a last line without a newline can be partial.
+    with csv_path.open("rb+") as handle:
+        content = handle.read()
+        if content and not content.endswith(b"\n"):
+            handle.truncate(content.rfind(b"\n") + 1)
+
+
+def _keep_trace_rows(trace_path: Path, run_keys: Container[tuple[str, ...]]) -> None:
+    """Drop the trace rows of runs that have no result row."""
+    if not trace_path.is_file():
+        return
+    _drop_partial_row(trace_path)
+    with trace_path.open(newline="") as handle:
+        reader = csv.DictReader(handle)
+        if reader.fieldnames != TRACE_FIELDNAMES:
+            raise ValueError(
+                f"{trace_path} has columns {reader.fieldnames}, expected "
+                f"{TRACE_FIELDNAMES}; cannot resume into it."
+            )
+        rows = [
+            row
+            for row in reader
+            if tuple(row[field] for field in RESUME_KEY_FIELDS) in run_keys
+        ]
+    staging_path = trace_path.with_name(f".{trace_path.name}.tmp")
+    with staging_path.open("w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=TRACE_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(staging_path, trace_path)
+
+
+def _read_resume_keys(csv_path: Path) -> set[tuple[str, ...]]:
+    if not csv_path.is_file():
+        return set()
+    _drop_partial_row(csv_path)
+    if csv_path.stat().st_size == 0:
+        return set()
+    with csv_path.open(newline="") as handle:
+        reader = csv.DictReader(handle)
+        if reader.fieldnames != RESULT_FIELDNAMES:
+            raise ValueError(
+                f"{csv_path} has columns {reader.fieldnames}, expected "
+                f"{RESULT_FIELDNAMES}; cannot resume into it."
+            )
+        return {tuple(row[field] for field in RESUME_KEY_FIELDS) for row in reader}
+
+
+class PhaseSummary:
+    """Per-scheduler totals of the evaluation and scheduler-internal phases."""
+
+    def __init__(self) -> None:
+        self._totals: dict[str, dict[str, list[float]]] = {}
+
+    def add(self, scheduler_name: str, phase: str, seconds: float) -> None:
+        total = self._totals.setdefault(scheduler_name, {}).setdefault(phase, [0, 0.0])
+        total[0] += 1
+        total[1] += seconds
+
+    def add_result(
+        self, scheduler_name: str, result: InstanceResult, *, write_sec: float
+    ) -> None:
+        self.add(scheduler_name, "load", result.load_sec)
+        self.add(scheduler_name, "write", write_sec)
+        if result.cached:
+            # Cached runs spent no scheduling time in this evaluation.
+            return
+        self.add(scheduler_name, "schedule", result.runtime_sec)
+        self.add(scheduler_name, "validate", result.validate_sec)
+        for phase, seconds in result.phases.items():
+            self.add(scheduler_name, f"schedule.{phase}", seconds)
+
+    def rows(self) -> list[dict[str, object]]:
+        return [
+            {
+                "scheduler": scheduler_name,
+                "phase": phase,
+                "runs": int(runs),
+                "total_sec": total_sec,
+                "mean_sec": total_sec / runs,
+            }
+            for scheduler_name, phases in self._totals.items()
+            for phase, (runs, total_sec) in phases.items()
+        ]
+
+    def write_csv(self, csv_path: Path) -> None:
+        with csv_path.open("w", newline="") as handle:
+            writer = csv.DictWriter(
+                handle,
+                fieldnames=["scheduler", "phase", "runs", "total_sec", "mean_sec"],
+            )
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+
+REPLICATE_SUMMARY_FIELDNAMES = [
+    "filename",
+    "iterations",
+    "seed",
+    "replicates",
+    "timeouts",
+    "total_cost_mean",
+    "total_cost_min",
+    "total_cost_max",
+    "total_cost_std",
+    "runtime_sec_mean",
+]
+
+
+def write_replicate_summary(csv_path: Path, summary_path: Path) -> None:
+    """
+    Summarize the replicates of every run in ``csv_path`` per instance.
+
+    Rows are grouped by (filename, iterations, seed). Timed-out replicates are
+    counted but have no cost; the standard deviation needs two finished replicates.
+    """
+
+    groups: dict[tuple[str, str, str], list[dict[str, str]]] = {}
+    with csv_path.open(newline="") as handle:
+        for row in csv.DictReader(handle):
+            key = (row["filename"], row["iterations"], row["seed"])
+            groups.setdefault(key, []).append(row)
+
+    with summary_path.open("w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=REPLICATE_SUMMARY_FIELDNAMES)
+        writer.writeheader()
+        for (filename, iterations, seed), rows in groups.items():
+            finished = [row for row in rows if row["status"] != TIMEOUT_STATUS]
+            costs = np.asarray([float(row["total_cost"]) for row in finished])
+            runtimes = np.asarray([float(row["runtime_sec"]) for row in finished])
+            writer.writerow(
+                {
+                    "filename": filename,
+                    "iterations": iterations,
+                    "seed": seed,
+                    "replicates": len(rows),
+                    "timeouts": len(rows) - len(finished),
+                    "total_cost_mean": costs.mean() if costs.size else "",
+                    "total_cost_min": costs.min() if costs.size else "",
+                    "total_cost_max": costs.max() if costs.size else "",
+                    "total_cost_std": costs.std(ddof=1) if costs.size > 1 else "",
+                    "runtime_sec_mean": runtimes.mean() if runtimes.size else "",
+                }
+            )
+
 
 def evaluate_schedulers(
     dataset_dir: Path,
@@ -118,7 +1068,109 @@ def evaluate_schedulers(
     output_dir: Path,
     validate: bool,
     verbose: bool,
+    layout: DatasetLayout = "auto",
+    workers: int | None = None,
+    order: EvaluationOrder = "scheduler",
+    resume: bool = False,
+    timing: TimingConfig = DEFAULT_TIMING,
+    trace_memory: bool = False,
+    time_budget: float | None = None,
+    trace_convergence: bool = False,
+    replicates: int = 1,
+    result_cache: Path | None = None,
+    slot_workers: int = 1,
 ) -> dict[str, list[dict[str, object]]]:
+    """
+    Run every scheduler on every dataset instance and write ``eval_<name>.csv``.
+
+    By default (``workers=None``) instances are evaluated in this process and each
+    scheduler draws from one RNG seeded ``seed + idx`` across all instances. With
+    ``workers`` set, (scheduler, instance) pairs run in a process pool (``0`` uses
+    all CPU cores, ``1`` runs in-process) and each pair gets its own RNG from
+    ``instance_seed_sequence``. Results then do not depend on the worker count, but
+    stochastic schedulers differ from the default mode. Rows keep dataset order.
+
+    ``order="scheduler"`` runs one scheduler on all instances before the next one.
+    ``order="instance"`` loads each instance once and runs every scheduler on it
+    before moving on, which avoids reloading it per scheduler. Both orders write
+    the same rows.
+
+    Rows are appended to the CSVs as they complete. With ``resume``, runs already
+    stored for the same (scheduler, filename, iterations, seed) are skipped and new
+    rows are appended. Resumed results match an uninterrupted run with ``workers``
+    set; in the default mode the shared per-scheduler RNG stream restarts, which
+    only affects stochastic schedulers. Returns the rows computed in this call.
+
+    ``timing`` controls warmup and repeated timing of every run (see
+    ``runtime_measurement``). ``runtime_sec`` holds the median wall time, next to
+    the minimum, the confidence interval of the mean, and the median CPU time.
+    Repetitions restore the scheduler RNG, so they do not change any schedule.
+
+    Rows also record the instance load and validation times and the scheduler's
+    internal phases. ``phase_summary.csv`` aggregates load, schedule, validate and
+    CSV write times, and the internal phases, per scheduler for this call.
+
+    With ``trace_memory`` every run is repeated once, untimed, to record the peak
+    traced allocation size and the peak RSS growth of the scheduler.
+
+    ``time_budget`` limits every scheduler run to that many seconds. Iterative
+    schedulers that support it stop and return their best schedule so far; other
+    schedulers are killed in a child process, and their rows get status
+    ``"timeout"`` and no cost.
+
+    With ``trace_convergence`` the incumbent costs reported by iterative schedulers
+    are written to ``trace_<name>.csv`` next to the results, one row per
+    improvement with its iteration and elapsed time (see ``convergence_trace``
+    for what a scheduler must report). Schedulers that report nothing get a
+    warning.
+
+    ``replicates`` runs every scheduler that many times per instance, each run
+    seeded independently with ``instance_seed_sequence`` and stored as its own row
+    with a ``replicate`` index. Replicates run in the process pool (on all CPU
+    cores unless ``workers`` is set). ``replicates_<name>.csv`` then reports the
+    mean, minimum, maximum and standard deviation of the cost per instance.
+
+    With ``result_cache`` set, results are cached in that directory (see
+    ``result_cache``) and runs found there are not repeated. Their rows have
+    ``cached`` set to 1 and carry the run times measured when they were stored,
+    which the runtime analyses reject. Without a ``seed`` nothing can hit, so the
+    cache is not used.
+
+    ``slot_workers`` lets each run of a ``packing_engine`` scheduler pack the time
+    slots of its instance in that many processes (``0`` uses all CPU cores). The
+    schedules do not change, only the run times. The slot pool is started once and
+    reused by every run, so it cannot be combined with ``workers`` (replicates then
+    run one after another).
+    """
+
+    if workers is not None and workers < 0:
+        raise ValueError("workers must be non-negative.")
+    if replicates < 1:
+        raise ValueError("replicates must be positive.")
+    if slot_workers < 0:
+        raise ValueError("slot_workers must be non-negative.")
+    if slot_workers != 1 and workers not in (None, 1):
+        raise ValueError(
+            "slot_workers and workers cannot both be other than 1: every worker "
+            "would start its own pool of slot workers."
+        )
+    if replicates > 1 and workers is None:
+        workers = 0 if slot_workers == 1 else 1
+    if time_budget is not None and time_budget <= 0:
+        raise ValueError("time_budget must be positive.")
+    config = RunConfig(
+        iterations=iterations,
+        validate=validate,
+        timing=timing,
+        trace_memory=trace_memory,
+        time_budget=time_budget,
+        trace_convergence=trace_convergence,
+        result_cache=(
+            None if result_cache is None or seed is None else ResultCache(result_cache)
+        ),
+        slot_workers=slot_workers,
+    )
+
     entries = list(_dataset_entries(dataset_dir))
     if limit is not None:
         entries = entries[:limit]
@@ -132,59 +1184,91 @@ def evaluate_schedulers(
         if canonical in canonical_names:
             raise ValueError(f"Duplicate scheduler '{canonical}' in list.")
         canonical_names.append(canonical)
+    if time_budget is not None:
+        for name in canonical_names:
+            if name in ITERATIVE_SCHEDULERS and not supports_time_budget(name):
+                warnings.warn(
+                    f"{name} is iterative but the installed simulator does not "
+                    "accept a time_budget for it. It runs in a child process that "
+                    "is killed at the budget, and a killed run keeps no "
+                    "best-so-far schedule (status 'timeout', no cost).",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
 
-    results: dict[str, list[dict[str, object]]] = {}
-    for idx, scheduler_name in enumerate(canonical_names):
-        scheduler_seed = None if seed is None else seed + idx
-        rng = np.random.default_rng(scheduler_seed)
-        scheduler_fn = build_scheduler(scheduler_name, iterations=iterations, rng=rng)
-
-        rows: list[dict[str, object]] = []
-        for npz_path, dims in entries:
-            result = run_on_instance(npz_path, scheduler_fn, validate=validate)
-            row: dict[str, object] = {
-                "filename": result.filename,
-                "K": dims["K"],
-                "J": dims["J"],
-                "M": dims["M"],
-                "T": dims["T"],
-                "total_cost": result.total_cost,
-                "total_machines": result.total_machines,
-                "runtime_sec": result.runtime_sec,
-                "machine_vector": " ".join(map(str, result.machine_vector.tolist())),
-            }
-            rows.append(row)
-            if verbose:
+    with ResultsWriter(
+        output_dir, canonical_names, resume=resume, traces=trace_convergence
+    ) as writer:
+        completed = writer.completed(iterations=iterations, seed=seed)
+        if workers is None:
+            instance_results = _serial_results(
+                entries,
+                canonical_names,
+                seed=seed,
+                load_problem=_problem_loader(dataset_dir, layout),
+                order=order,
+                config=config,
+                completed=completed,
+            )
+        else:
+            instance_results = _parallel_results(
+                entries,
+                canonical_names,
+                dataset_dir=dataset_dir,
+                layout=layout,
+                seed=seed,
+                workers=workers,
+                order=order,
+                config=config,
+                completed=completed,
+                replicates=replicates,
+            )
+
+        results: dict[str, list[dict[str, object]]] = {}
+        phase_summary = PhaseSummary()
+        untraced: dict[str, int] = {}
+        for scheduler_name, dims, result in instance_results:
+            if (
+                trace_convergence
+                and result.status != TIMEOUT_STATUS
+                and not result.convergence
+            ):
+                untraced[scheduler_name] = untraced.get(scheduler_name, 0) + 1
+            row = _result_row(result, dims, config=config, seed=seed)
+            write_sec = writer.write(scheduler_name, row, result.convergence)
+            phase_summary.add_result(scheduler_name, result, write_sec=write_sec)
+            results.setdefault(scheduler_name, []).append(row)
+            if verbose and result.status == TIMEOUT_STATUS:
+                print(
+                    f"[{scheduler_name}] {result.filename}: "
+                    f"timed out after {result.runtime_sec:.3f}s"
+                )
+            elif verbose:
                 print(
                     f"[{scheduler_name}] {result.filename}: "
                     f"cost={result.total_cost:.4f}, "
                     f"machines={result.machine_vector}, "
                     f"runtime={result.runtime_sec:.3f}s"
+                    f"{' (cached)' if result.cached else ''}"
                 )
 
-        if rows:
-            output_dir.mkdir(parents=True, exist_ok=True)
-            output_csv = output_dir / scheduler_output_filename(scheduler_name)
-            with output_csv.open("w", newline="") as handle:
-                writer = csv.DictWriter(
-                    handle,
-                    fieldnames=[
-                        "filename",
-                        "K",
-                        "J",
-                        "M",
-                        "T",
-                        "total_cost",
-                        "total_machines",
-                        "runtime_sec",
-                        "machine_vector",
-                    ],
-                )
-                writer.writeheader()
-                writer.writerows(rows)
-
-        results[scheduler_name] = rows
-
+    for scheduler_name, runs in untraced.items():
+        warnings.warn(
+            f"{scheduler_name} reported no convergence trace points in {runs} "
+            f"run(s), so {trace_output_filename(scheduler_name)} has no rows for them. "
+            "Schedulers must call convergence_trace.record_improvement or return "
+            "a convergence_trace sequence to be traced.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    if results:
+        phase_summary.write_csv(output_dir / PHASE_SUMMARY_NAME)
+    if replicates > 1:
+        for scheduler_name in canonical_names:
+            write_replicate_summary(
+                output_dir / scheduler_output_filename(scheduler_name),
+                output_dir / replicate_summary_filename(scheduler_name),
+            )
     return results
 
 
@@ -196,7 +1280,16 @@ def parse_args() -> argparse.Namespace:
         "--dataset",
         type=Path,
         default=Path("dataset"),
-        help="Directory containing dataset.csv and NPZ instances.",
+        help="Directory containing dataset.csv and NPZ or packed instances.",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=("auto", "npz", "packed"),
+        default="auto",
+        help=(
+            "Dataset storage layout. 'auto' memory-maps the packed layout when "
+            "packed/index.csv exists and reads NPZ files otherwise."
+        ),
     )
     scheduler_group = parser.add_mutually_exclusive_group()
     scheduler_group.add_argument(
@@ -239,6 +1332,125 @@ def parse_args() -> argparse.Namespace:
         default=Path("eval_results"),
         help="Directory to write per-scheduler results CSVs.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=(
+            "Evaluate (scheduler, instance) pairs in N worker processes (0 = all "
+            "CPU cores). Each pair gets its own RNG derived from --seed, so results "
+            "do not depend on N, but stochastic schedulers differ from the default "
+            "serial mode."
+        ),
+    )
+    parser.add_argument(
+        "--order",
+        choices=("scheduler", "instance"),
+        default="scheduler",
+        help=(
+            "'scheduler' runs each scheduler on all instances in turn; 'instance' "
+            "loads each instance once and runs all schedulers on it. Both write "
+            "the same results."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Keep existing results CSVs in --output-dir and skip (scheduler, "
+            "instance) runs they already contain for the same --iterations and "
+            "--seed. Rows are written and synced to disk as they complete."
+        ),
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=0,
+        help="Untimed runs before timing each (scheduler, instance) pair.",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=1,
+        help="Minimum number of timed runs per (scheduler, instance) pair.",
+    )
+    parser.add_argument(
+        "--max-repeats",
+        dest="max_repeats",
+        type=int,
+        default=None,
+        help=(
+            "Keep adding timed runs, up to this many, until the 95%% confidence "
+            "interval of the mean runtime is narrower than --target-ci-width "
+            "(default: --repeats, i.e. no adaptive repetitions)."
+        ),
+    )
+    parser.add_argument(
+        "--target-ci-width",
+        dest="target_ci_width",
+        type=float,
+        default=0.05,
+        help="Target confidence interval width relative to the mean runtime.",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        dest="trace_memory",
+        action="store_true",
+        help=(
+            "Run each (scheduler, instance) pair once more, untimed, under "
+            "tracemalloc and record its peak traced memory and peak RSS growth."
+        ),
+    )
+    parser.add_argument(
+        "--time-budget",
+        dest="time_budget",
+        type=float,
+        default=None,
+        help=(
+            "Wall-clock budget in seconds per scheduler run. Iterative schedulers "
+            "that support it return their best schedule so far; other schedulers "
+            "are killed and recorded with status 'timeout'."
+        ),
+    )
+    parser.add_argument(
+        "--trace-convergence",
+        action="store_true",
+        help=(
+            "Record (iteration, elapsed time, cost) of every improvement reported "
+            "by iterative schedulers in trace_<name>.csv."
+        ),
+    )
+    parser.add_argument(
+        "--replicates",
+        type=int,
+        default=1,
+        help=(
+            "Independently seeded runs per (scheduler, instance), stored as rows "
+            "with a replicate index and summarized in replicates_<name>.csv. "
+            "Replicates run in parallel (see --workers)."
+        ),
+    )
+    parser.add_argument(
+        "--result-cache",
+        type=Path,
+        default=None,
+        help=(
+            "Directory of the schedule result cache. Runs with the same instance, "
+            "scheduler and timing settings and --seed are read from it instead "
+            "of recomputed, and flagged in the cached column. Unused without "
+            "--seed. Runtime analyses reject cached rows."
+        ),
+    )
+    parser.add_argument(
+        "--slot-workers",
+        dest="slot_workers",
+        type=int,
+        default=1,
+        help=(
+            "Pack the time slots of each instance in N processes (0 = all CPU "
+            "cores). Only the *_engine schedulers use it; schedules do not change."
+        ),
+    )
     parser.add_argument(
         "--validate",
         action="store_true",
@@ -249,7 +1461,28 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print per-instance results (default: off).",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    if args.workers is not None and args.workers < 0:
+        parser.error("--workers must be non-negative.")
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error("--time-budget must be positive.")
+    if args.slot_workers < 0:
+        parser.error("--slot-workers must be non-negative.")
+    if args.slot_workers != 1 and args.workers not in (None, 1):
+        parser.error("--slot-workers cannot be combined with --workers other than 1.")
+    if args.max_repeats is None:
+        args.max_repeats = args.repeats
+    try:
+        args.timing = TimingConfig(
+            warmup=args.warmup,
+            min_repeats=args.repeats,
+            max_repeats=args.max_repeats,
+            target_ci_width=args.target_ci_width,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    return args
 
 
 def main() -> None:
@@ -271,6 +1504,17 @@ def main() -> None:
         output_dir=args.output_dir,
         validate=args.validate,
         verbose=args.verbose,
+        layout=args.layout,
+        workers=args.workers,
+        order=args.order,
+        resume=args.resume,
+        timing=args.timing,
+        trace_memory=args.trace_memory,
+        time_budget=args.time_budget,
+        trace_convergence=args.trace_convergence,
+        replicates=args.replicates,
+        result_cache=args.result_cache,
+        slot_workers=args.slot_workers,
     )
     if not results:
         print("No instances were evaluated.")
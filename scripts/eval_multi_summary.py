@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import argparse
 import csv
+import warnings
 from numbers import Real
 from pathlib import Path
 
 import numpy as np
 
 from eval_utils import (
+    TIMEOUT_STATUS,
     display_scheduler_name,
     normalize_scheduler_name,
     parse_scheduler_list,
@@ -39,12 +41,29 @@ def _summarize_scheduler(
     costs: list[float] = []
     runtimes: list[float] = []
     machine_counts: list[int] = []
+    cached_runs = 0
+    # Every row is one run, including each replicate of an instance, so the
+    # averages are over runs and min/max are those of single runs.
     with csv_path.open(newline="") as handle:
         reader = csv.DictReader(handle)
         for row in reader:
+            if row.get("status") == TIMEOUT_STATUS:
+                continue
             costs.append(float(row["total_cost"]))
-            runtimes.append(float(row["runtime_sec"]))
             machine_counts.append(int(row["total_machines"]))
+            if row.get("cached") == "1":
+                # Runtime measured by an earlier evaluation.
+                cached_runs += 1
+                continue
+            runtimes.append(float(row["runtime_sec"]))
+
+    if cached_runs:
+        warnings.warn(
+            f"{csv_path}: {cached_runs} run(s) were read from the result cache; "
+            "avg_runtime_sec only covers the runs measured in this evaluation.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
 
     if not costs:
         return None
@@ -57,7 +76,7 @@ def _summarize_scheduler(
     avg_cost = float(costs_array.mean())
     min_cost = float(costs_array.min())
     max_cost = float(costs_array.max())
-    avg_runtime_sec = float(runtimes_array.mean())
+    avg_runtime_sec = float(runtimes_array.mean()) if runtimes else float("nan")
     avg_machines = float(machines_array.mean())
 
     row: dict[str, object] = {
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import csv
+import inspect
 from collections.abc import Callable
+from functools import partial
 from pathlib import Path
 from typing import Literal
 
@@ -9,7 +11,10 @@ import numpy as np
 
 from simulator.algorithms import ScheduleResult
 from simulator.problem import ProblemInstance
-from simulator.schedulers import get_scheduler, normalize_scheduler_name
+from simulator.schedulers import get_scheduler
+from simulator.schedulers import normalize_scheduler_name as _normalize_simulator_name
+
+from packing_engine import ENGINE_SCHEDULERS, pack
 
 DISPLAY_SCHEDULER_NAMES = {
     "bfd": "BFD",
@@ -20,8 +25,29 @@ DISPLAY_SCHEDULER_NAMES = {
     "ffd_new": "FFDNew",
     "ffd_prod": "FFDProd",
     "ffd_sum": "FFDSum",
+    "bfd_engine": "BFDEngine",
+    "ffd_new_engine": "FFDNewEngine",
+    "ffd_engine": "FFDEngine",
+    "ffd_l2_engine": "FFDL2Engine",
+    "ffd_max_engine": "FFDMaxEngine",
+    "ffd_prod_engine": "FFDProdEngine",
+    "ffd_sum_engine": "FFDSumEngine",
 }
 
+# Schedulers that improve a schedule over iterations and can stop early with their
+# best schedule so far when given a time budget.
+ITERATIVE_SCHEDULERS = frozenset({"ruin_recreate", "ffd_with_repack"})
+# ``status`` value of an eval row whose scheduler was killed at its time budget.
+TIMEOUT_STATUS = "timeout"
+
+
+def normalize_scheduler_name(name: str) -> str:
+    """Canonical scheduler name, including the local ``packing_engine`` ones."""
+    canonical = name.strip().lower().replace("-", "_")
+    if canonical in ENGINE_SCHEDULERS:
+        return canonical
+    return _normalize_simulator_name(name)
+
 
 def parse_scheduler_list(value: str) -> list[str]:
     return [item.strip() for item in value.split(",") if item.strip()]
@@ -32,14 +58,51 @@ def scheduler_output_filename(name: str) -> str:
     return f"eval_{canonical}.csv"
 
 
+def trace_output_filename(name: str) -> str:
+    canonical = normalize_scheduler_name(name)
+    return f"trace_{canonical}.csv"
+
+
+def replicate_summary_filename(name: str) -> str:
+    canonical = normalize_scheduler_name(name)
+    return f"replicates_{canonical}.csv"
+
+
 def display_scheduler_name(name: str) -> str:
     canonical = normalize_scheduler_name(name)
     return DISPLAY_SCHEDULER_NAMES.get(canonical, canonical)
 
 
+def supports_time_budget(name: str) -> bool:
+    """Whether ``name`` stops by itself when its time budget runs out."""
+    return (
+        normalize_scheduler_name(name) in ITERATIVE_SCHEDULERS
+        and "time_budget" in inspect.signature(get_scheduler).parameters
+    )
+
+
 def build_scheduler(
-    name: str, *, iterations: int, rng: np.random.Generator
+    name: str,
+    *,
+    iterations: int,
+    rng: np.random.Generator,
+    time_budget: float | None = None,
+    slot_workers: int = 1,
 ) -> Callable[[ProblemInstance], ScheduleResult]:
+    """
+    Scheduler ``name`` as a function of the problem instance.
+
+    ``slot_workers`` only applies to the ``packing_engine`` schedulers, which
+    pack the time slots in that many processes (0 = all CPU cores).
+    """
+    canonical = normalize_scheduler_name(name)
+    if canonical in ENGINE_SCHEDULERS:
+        # Deterministic, single-pass packers: no RNG, iterations or time budget.
+        return partial(pack, rules=ENGINE_SCHEDULERS[canonical], workers=slot_workers)
+    if time_budget is not None and supports_time_budget(name):
+        return get_scheduler(
+            name, iterations=iterations, rng=rng, time_budget=time_budget
+        )
     return get_scheduler(name, iterations=iterations, rng=rng)
 
 
@@ -49,13 +112,33 @@ def resolve_results_csv(results_dir: Path, scheduler_name: str) -> tuple[str, Pa
     return canonical, csv_path
 
 
+DuplicatePolicy = Literal["min", "error"]
+ReplicatePolicy = Literal["mean", "min", "error"]
+
+
 def load_metric_values(
     csv_path: Path,
     *,
     column: str,
-    duplicate_policy: Literal["min", "error"] = "min",
+    duplicate_policy: DuplicatePolicy = "min",
+    replicate_policy: ReplicatePolicy = "mean",
+    allow_cached: bool = True,
 ) -> dict[str, float]:
-    values: dict[str, float] = {}
+    """
+    Load one value of ``column`` per instance from a results CSV.
+
+    Rows of different replicates (``eval.py --replicates``) are independent runs
+    and are combined with ``replicate_policy``: their mean by default, so a
+    stochastic scheduler is not credited with its best of several runs. Repeated
+    rows of the same replicate (e.g. from appending several evaluations to one
+    file) are combined with ``duplicate_policy``. Files without a ``replicate``
+    column hold replicate 0 only. Rows with status ``timeout`` are skipped.
+
+    Without ``allow_cached``, rows read from the result cache (``cached`` set to 1)
+    raise ValueError: their runtimes were measured by an earlier evaluation.
+    """
+
+    samples: dict[str, dict[str, float]] = {}
     with csv_path.open(newline="") as handle:
         reader = csv.DictReader(handle)
         if not reader.fieldnames:
@@ -66,7 +149,17 @@ def load_metric_values(
             raise ValueError(f"{csv_path} missing required columns: {sorted(missing)}.")
 
         for row in reader:
+            if row.get("status") == TIMEOUT_STATUS:
+                # Killed at its time budget; there is no schedule to compare.
+                continue
             filename = row["filename"]
+            if not allow_cached and row.get("cached") == "1":
+                raise ValueError(
+                    f"{csv_path} row for {filename} was read from the result "
+                    f"cache, so its {column} was not measured in this evaluation. "
+                    "Re-run eval.py without --result-cache."
+                )
+            replicate = row.get("replicate") or "0"
             raw_value = row[column]
             try:
                 value = float(raw_value)
@@ -75,36 +168,66 @@ def load_metric_values(
                     f"{csv_path} has invalid {column} for {filename}: {raw_value}"
                 ) from exc
 
-            if filename in values:
+            replicates = samples.setdefault(filename, {})
+            if replicate in replicates:
                 if duplicate_policy == "error":
                     raise ValueError(
                         f"{csv_path} has duplicate filename entry: {filename}."
                     )
                 if duplicate_policy == "min":
-                    values[filename] = min(values[filename], value)
+                    replicates[replicate] = min(replicates[replicate], value)
                 else:
                     raise ValueError(f"Unknown duplicate policy: {duplicate_policy}")
             else:
-                values[filename] = value
+                replicates[replicate] = value
 
-    if not values:
+    if not samples:
         raise ValueError(f"{csv_path} has no rows to evaluate.")
+
+    values: dict[str, float] = {}
+    for filename, replicates in samples.items():
+        replicate_values = list(replicates.values())
+        if replicate_policy == "mean":
+            values[filename] = float(np.mean(replicate_values))
+        elif replicate_policy == "min":
+            values[filename] = min(replicate_values)
+        elif replicate_policy == "error":
+            if len(replicate_values) > 1:
+                raise ValueError(
+                    f"{csv_path} has {len(replicate_values)} replicates of {filename}."
+                )
+            values[filename] = replicate_values[0]
+        else:
+            raise ValueError(f"Unknown replicate policy: {replicate_policy}")
     return values
 
 
 def load_total_costs(
-    csv_path: Path, *, duplicate_policy: Literal["min", "error"] = "min"
+    csv_path: Path,
+    *,
+    duplicate_policy: DuplicatePolicy = "min",
+    replicate_policy: ReplicatePolicy = "mean",
 ) -> dict[str, float]:
     return load_metric_values(
-        csv_path, column="total_cost", duplicate_policy=duplicate_policy
+        csv_path,
+        column="total_cost",
+        duplicate_policy=duplicate_policy,
+        replicate_policy=replicate_policy,
     )
 
 
 def load_runtime_seconds(
-    csv_path: Path, *, duplicate_policy: Literal["min", "error"] = "min"
+    csv_path: Path,
+    *,
+    duplicate_policy: DuplicatePolicy = "min",
+    replicate_policy: ReplicatePolicy = "mean",
 ) -> dict[str, float]:
     return load_metric_values(
-        csv_path, column="runtime_sec", duplicate_policy=duplicate_policy
+        csv_path,
+        column="runtime_sec",
+        duplicate_policy=duplicate_policy,
+        replicate_policy=replicate_policy,
+        allow_cached=False,
     )
 
 
@@ -1,25 +1,57 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import itertools
 from pathlib import Path
 
 import numpy as np
 
+from dataset_cache import cached_dataset, link_dataset, unshare_file
+from packed_dataset import packed_dir
 from problem_generation import (
     DEFAULT_BASE_CAPACITY,
     DEFAULT_BASE_DEMAND,
+    DEFAULT_BASE_SLOT_LOAD,
     RESOURCE_COUNT,
     generate_dataset_instances,
+    generate_dataset_parallel,
     write_dataset,
     write_dataset_parameters_csv,
 )
 
 NUM_INSTANCES = 100
 
+# Sweep axis -> arguments fixed to the grid value in each dataset of the sweep.
+SWEEP_AXES = {
+    "J": ("J_min", "J_max"),
+    "M": ("M_min", "M_max"),
+    "T": ("T_min", "T_max"),
+    "slot_load": ("base_slot_load",),
+}
+SWEEP_MANIFEST_NAME = "sweep_manifest.csv"
 
-def parse_args():
+# Arguments that do not change the generated files and are left out of the cache key.
+NON_CACHE_KEY_ARGS = (
+    "output_dir",
+    "cache_dir",
+    "workers",
+    "iterations",
+    "append",
+    *(f"sweep_{axis}" for axis in SWEEP_AXES),
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run scheduler.")
     parser.add_argument("--seed", type=int, help="Seed for random instance generation.")
+    parser.add_argument(
+        "--num-instances",
+        dest="num_instances",
+        type=int,
+        default=NUM_INSTANCES,
+        help="Number of instances in the dataset.",
+    )
     parser.add_argument(
         "--iterations",
         type=int,
@@ -138,14 +170,136 @@ def parse_args():
         default=200,
         help="Maximum value for T range.",
     )
+    parser.add_argument(
+        "--base-slot-load",
+        dest="base_slot_load",
+        type=int,
+        default=DEFAULT_BASE_SLOT_LOAD,
+        help="Mean total job count per time slot before jitter.",
+    )
     parser.add_argument(
         "--output-dir",
         dest="output_dir",
         default="dataset",
         help="Output directory for the generated dataset.",
     )
+    parser.add_argument(
+        "--batched-job-counts",
+        dest="batched_job_counts",
+        action="store_true",
+        help=(
+            "Sample each job-count matrix in one batched multinomial call "
+            "(faster for large T; does not reproduce datasets generated without it)."
+        ),
+    )
+    parser.add_argument(
+        "--batched-repair",
+        dest="batched_repair",
+        action="store_true",
+        help=(
+            "Repair all job types that fit no machine type in one batched step "
+            "(faster for large J and M; does not reproduce datasets generated "
+            "without it)."
+        ),
+    )
+    parser.add_argument(
+        "--sparse-job-counts",
+        dest="sparse_job_counts",
+        action="store_true",
+        help=(
+            "Store job counts per time slot in CSR form (only non-zero counts). "
+            "Sampled values are the same as with the dense default."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=(
+            "Generate instances in N worker processes (0 = all CPU cores), seeding "
+            "each instance independently from --seed. The output does not depend on "
+            "N, but differs from the default single-stream generation."
+        ),
+    )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help=(
+            "Store the dataset in the packed layout (one contiguous file per array "
+            "kind under packed/) instead of one NPZ file per instance."
+        ),
+    )
+    parser.add_argument(
+        "--compact-dtypes",
+        dest="compact_dtypes",
+        action="store_true",
+        help="Store each array with the smallest lossless integer/float dtype.",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Write compressed NPZ files (smaller on disk, slower to load).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        type=Path,
+        default=None,
+        help=(
+            "Reuse datasets from this content-addressed cache. Datasets are keyed "
+            "by the seed, the generation parameters and the generator code, and "
+            "are hard-linked into --output-dir after an integrity check."
+        ),
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help=(
+            "Extend the dataset in --output-dir to --num-instances instances. Only "
+            "the missing instances are generated, from per-instance seeds, so the "
+            "result matches generating all instances at once with --workers. "
+            "The seed, generation and storage options that are not given are "
+            "taken from the existing dataset; those that are given must match it."
+        ),
+    )
+    for axis in SWEEP_AXES:
+        parser.add_argument(
+            f"--sweep-{axis.replace('_', '-')}",
+            dest=f"sweep_{axis}",
+            type=geometric_grid,
+            default=None,
+            metavar="START:STOP:NUM",
+            help=(
+                f"Sweep {axis} over NUM geometrically spaced integers from START "
+                "to STOP. With any --sweep-* option, one dataset is generated per "
+                "grid point under --output-dir, and sweep_manifest.csv maps each "
+                "dataset to its grid coordinates."
+            ),
+        )
+    return parser
+
+
+def parse_args():
+    parser = build_parser()
     args = parser.parse_args()
 
+    if args.num_instances < 1:
+        parser.error("--num-instances must be positive.")
+    if args.base_slot_load < 1:
+        parser.error("--base-slot-load must be positive.")
+    if args.append and sweep_axes(args):
+        parser.error("--append cannot be combined with --sweep-* options.")
+    if args.append and args.cache_dir is not None:
+        parser.error("--append cannot be combined with --cache-dir.")
+    if args.append:
+        _use_recorded_parameters(parser, args)
+    if args.append and args.workers is None:
+        # Appending needs per-instance seeds, which only the worker mode uses.
+        args.workers = 0
+    if args.workers is not None and args.workers < 0:
+        parser.error("--workers must be non-negative.")
+    if args.packed and args.compress:
+        parser.error("--compress cannot be combined with --packed.")
     if args.K_min != RESOURCE_COUNT or args.K_max != RESOURCE_COUNT:
         parser.error(
             f"K is fixed to {RESOURCE_COUNT}; set --K-min and --K-max to {RESOURCE_COUNT}."
@@ -153,7 +307,99 @@ def parse_args():
     return args
 
 
-def generate_instances(args, rng: np.random.Generator):
+def _given_options(parser: argparse.ArgumentParser) -> set[str]:
+    """Destinations of the options given on the command line."""
+    not_given = object()
+    explicit_parser = build_parser()
+    explicit_parser.set_defaults(
+        **{action.dest: not_given for action in parser._actions}
+    )
+    return {
+        key
+        for key, value in vars(explicit_parser.parse_args()).items()
+        if value is not not_given
+    }
+
+
+def _parse_recorded(action: argparse.Action, text: str) -> object:
+    if text == "None":
+        return None
+    if isinstance(action.default, bool):
+        return text == "True"
+    return action.type(text) if callable(action.type) else text
+
+
+def _use_recorded_parameters(parser: argparse.ArgumentParser, args) -> None:
+    """
+    Complete ``--append`` arguments from the dataset in ``--output-dir``.
+
+    Options that were not given are set to the values recorded in the last row of
+    ``dataset_parameters.csv``; options that were given must equal them.
+    Parameters the row does not record were added after the dataset was
+    generated, which therefore used their defaults.
+    """
+
+    output_dir = Path(args.output_dir)
+    existing = len(_read_csv_rows(output_dir / "dataset.csv"))
+    previous = _read_csv_rows(output_dir / "dataset_parameters.csv")
+    if existing == 0 or not previous:
+        parser.error(f"--append: no dataset to append to in {output_dir}.")
+    recorded = previous[-1]
+    if _recorded_seeding(recorded) != "spawned":
+        parser.error(
+            "--append: only datasets generated with per-instance seeds (--workers) "
+            "can be extended; regenerate the dataset with --workers first."
+        )
+    if args.num_instances < existing:
+        parser.error(
+            f"--append: the dataset already has {existing} instances; "
+            "--num-instances must be at least that."
+        )
+
+    actions = {action.dest: action for action in parser._actions}
+    given = _given_options(parser)
+    mismatched = []
+    for key, value in cache_parameters(args).items():
+        if key in ("num_instances", "instance_seeding"):
+            continue
+        action = actions[key]
+        recorded_value = recorded.get(key) or str(action.default)
+        if key not in given:
+            setattr(args, key, _parse_recorded(action, recorded_value))
+        elif recorded_value != str(value):
+            mismatched.append(f"{action.option_strings[0]} (dataset: {recorded_value})")
+    if mismatched:
+        parser.error(
+            "--append: options differ from the existing dataset: "
+            + ", ".join(sorted(mismatched))
+        )
+
+
+def geometric_grid(spec: str) -> list[int]:
+    """Parse ``START:STOP:NUM`` into distinct, geometrically spaced integers."""
+    try:
+        start, stop, num = (int(part) for part in spec.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected START:STOP:NUM with integers, got {spec!r}."
+        ) from None
+    if start < 1 or stop < start or num < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected 1 <= START <= STOP and NUM >= 1, got {spec!r}."
+        )
+    values = np.unique(np.rint(np.geomspace(start, stop, num)).astype(int))
+    return [int(value) for value in values]
+
+
+def sweep_axes(args) -> dict[str, list[int]]:
+    return {
+        axis: getattr(args, f"sweep_{axis}")
+        for axis in SWEEP_AXES
+        if getattr(args, f"sweep_{axis}") is not None
+    }
+
+
+def _base_resource_values(args):
     base_capacity = {
         "cpu": args.base_capacity_cpu,
         "memory": args.base_capacity_memory,
@@ -166,8 +412,13 @@ def generate_instances(args, rng: np.random.Generator):
         "disk": args.base_demand_disk,
         "io": args.base_demand_io,
     }
+    return base_capacity, base_demand
+
+
+def generate_instances(args, rng: np.random.Generator):
+    base_capacity, base_demand = _base_resource_values(args)
     return generate_dataset_instances(
-        num_instances=NUM_INSTANCES,
+        num_instances=args.num_instances,
         K_range=(args.K_min, args.K_max),
         J_range=(args.J_min, args.J_max),
         M_range=(args.M_min, args.M_max),
@@ -175,27 +426,201 @@ def generate_instances(args, rng: np.random.Generator):
         base_capacity=base_capacity,
         base_demand=base_demand,
         rng=rng,
+        batched_job_counts=args.batched_job_counts,
+        batched_repair=args.batched_repair,
+        sparse_job_counts=args.sparse_job_counts,
+        base_slot_load=args.base_slot_load,
     )
 
 
-def write_instances(instances, output_dir: str):
-    return write_dataset(instances, dataset_dir=output_dir)
+def write_instances(instances, output_dir: str, *, args):
+    return write_dataset(
+        instances,
+        dataset_dir=output_dir,
+        packed=args.packed,
+        compact_dtypes=args.compact_dtypes,
+        compress=args.compress,
+    )
+
+
+def generate_instances_parallel(args, output_dir: str | Path, *, start: int = 0):
+    base_capacity, base_demand = _base_resource_values(args)
+    return generate_dataset_parallel(
+        num_instances=args.num_instances,
+        K_range=(args.K_min, args.K_max),
+        J_range=(args.J_min, args.J_max),
+        M_range=(args.M_min, args.M_max),
+        T_range=(args.T_min, args.T_max),
+        base_capacity=base_capacity,
+        base_demand=base_demand,
+        dataset_dir=output_dir,
+        seed=args.seed,
+        workers=args.workers or None,
+        batched_job_counts=args.batched_job_counts,
+        batched_repair=args.batched_repair,
+        sparse_job_counts=args.sparse_job_counts,
+        base_slot_load=args.base_slot_load,
+        packed=args.packed,
+        compact_dtypes=args.compact_dtypes,
+        compress=args.compress,
+        start=start,
+    )
+
+
+def build_dataset(args, output_dir: str | Path) -> None:
+    if args.workers is not None:
+        _ = generate_instances_parallel(args, output_dir)
+    else:
+        rng = np.random.default_rng(args.seed)
+        instances = generate_instances(args, rng)
+        _ = write_instances(instances, output_dir, args=args)
+
+
+def cache_parameters(args) -> dict[str, object]:
+    parameters = {
+        key: value for key, value in vars(args).items() if key not in NON_CACHE_KEY_ARGS
+    }
+    parameters["instance_seeding"] = instance_seeding(args)
+    return parameters
+
+
+def instance_seeding(args) -> str:
+    # Per-instance seeding gives the same files for every worker count.
+    return "shared" if args.workers is None else "spawned"
+
+
+def _read_csv_rows(csv_path: Path) -> list[dict[str, str]]:
+    if not csv_path.is_file():
+        return []
+    with csv_path.open(newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+def _recorded_seeding(parameters: dict[str, str]) -> str:
+    if parameters.get("instance_seeding"):
+        return parameters["instance_seeding"]
+    # Rows written before seeding was recorded: only the worker mode spawned seeds.
+    return "spawned" if parameters.get("workers") else "shared"
+
+
+def append_to_dataset(args, output_dir: Path) -> int:
+    """
+    Generate instances ``N..num_instances-1`` of an existing dataset in place.
+
+    ``args`` must have been completed from the dataset's recorded parameters by
+    ``parse_args``. Returns the number of instances that were already present.
+    """
+
+    existing = len(_read_csv_rows(output_dir / "dataset.csv"))
+
+    # Files linked from a dataset cache are shared; copy them before appending.
+    unshare_file(output_dir / "dataset.csv")
+    if args.packed:
+        for path in packed_dir(output_dir).iterdir():
+            unshare_file(path)
+    _ = generate_instances_parallel(args, output_dir, start=existing)
+    return existing
+
+
+def generate_one_dataset(args) -> None:
+    output_dir = Path(args.output_dir)
+    if args.cache_dir is None:
+        build_dataset(args, output_dir)
+    else:
+        entry_dir, hit = cached_dataset(
+            args.cache_dir,
+            cache_parameters(args),
+            lambda staging_dir: build_dataset(args, staging_dir),
+        )
+        link_dataset(entry_dir, output_dir)
+        print(f"Dataset cache {'hit' if hit else 'miss'}: {entry_dir}")
+    write_dataset_parameters_csv(
+        {**vars(args), "instance_seeding": instance_seeding(args)},
+        dataset_dir=output_dir,
+    )
+
+
+def _sweep_dataset_name(point: dict[str, int]) -> str:
+    return "_".join(f"{axis}{value}" for axis, value in point.items())
+
+
+def generate_sweep(args) -> list[dict[str, object]]:
+    """
+    Generate one dataset per point of the grid spanned by the ``--sweep-*`` axes.
+
+    Each dataset is written to ``<output_dir>/<name>/`` with every swept parameter
+    fixed to its grid value and all other parameters as given. Every dataset uses the
+    same seed. Returns the manifest rows, also written to ``sweep_manifest.csv``.
+    """
+
+    axes = sweep_axes(args)
+    sweep_dir = Path(args.output_dir)
+    sweep_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest: list[dict[str, object]] = []
+    for values in itertools.product(*axes.values()):
+        point = dict(zip(axes, values))
+        name = _sweep_dataset_name(point)
+        dataset_args = argparse.Namespace(**vars(args))
+        dataset_args.output_dir = str(sweep_dir / name)
+        for axis, value in point.items():
+            for key in SWEEP_AXES[axis]:
+                setattr(dataset_args, key, value)
+            setattr(dataset_args, f"sweep_{axis}", None)
+
+        print(f"=== Sweep dataset: {name} ===")
+        generate_one_dataset(dataset_args)
+        manifest.append(
+            {
+                "dataset": name,
+                "dataset_dir": dataset_args.output_dir,
+                **{f"sweep_{axis}": value for axis, value in point.items()},
+                "J_min": dataset_args.J_min,
+                "J_max": dataset_args.J_max,
+                "M_min": dataset_args.M_min,
+                "M_max": dataset_args.M_max,
+                "T_min": dataset_args.T_min,
+                "T_max": dataset_args.T_max,
+                "base_slot_load": dataset_args.base_slot_load,
+                "num_instances": dataset_args.num_instances,
+                "seed": dataset_args.seed,
+            }
+        )
+
+    with (sweep_dir / SWEEP_MANIFEST_NAME).open("w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(manifest[0]))
+        writer.writeheader()
+        writer.writerows(manifest)
+    return manifest
 
 
 def main():
     args = parse_args()
 
+    if args.append:
+        output_dir = Path(args.output_dir)
+        existing = append_to_dataset(args, output_dir)
+        print(f"SEED: {args.seed}")
+        print(f"Appended {args.num_instances - existing} instances to {output_dir}")
+        write_dataset_parameters_csv(
+            {**vars(args), "instance_seeding": instance_seeding(args)},
+            dataset_dir=output_dir,
+            replace_last=True,
+        )
+        return
+
     seed = args.seed if args.seed is not None else np.random.randint(1_000_000)
     args.seed = seed
     print(f"SEED: {seed}")
-    rng = np.random.default_rng(seed)
 
-    instances = generate_instances(args, rng)
-    _ = write_instances(instances, args.output_dir)
-    write_dataset_parameters_csv(
-        {"num_instances": NUM_INSTANCES, **vars(args)},
-        dataset_dir=Path(args.output_dir),
-    )
+    if sweep_axes(args):
+        manifest = generate_sweep(args)
+        print(
+            f"Wrote {len(manifest)} sweep datasets to {args.output_dir} "
+            f"({SWEEP_MANIFEST_NAME})"
+        )
+        return
+    generate_one_dataset(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+"""
+Peak memory measurement of a single scheduler run.
+
+``measure_memory`` reports two numbers:
+
+- the peak of Python and NumPy allocations traced by ``tracemalloc`` during the
+  run, above what was allocated when it started;
+- the growth of the process's peak resident set size (``getrusage``). It only
+  grows when the run exceeds every earlier peak of the process, so it is most
+  meaningful in a fresh worker process.
+
+``tracemalloc`` slows allocations down considerably, so traced runs should not
+be timed.
+"""
+
+from __future__ import annotations
+
+import resource
+import sys
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+ResultT = TypeVar("ResultT")
+
+
+@dataclass(frozen=True)
+class MemoryUsage:
+    peak_traced_bytes: int
+    rss_delta_bytes: int
+
+
+def max_rss_bytes() -> int:
+    """Peak resident set size of this process so far, in bytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB on Linux.
+    return int(max_rss) if sys.platform == "darwin" else int(max_rss) * 1024
+
+
+def measure_memory(fn: Callable[[], ResultT]) -> tuple[ResultT, MemoryUsage]:
+    """Run ``fn`` once and return its result with its peak memory usage."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        rss_before = max_rss_bytes()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        rss_after = max_rss_bytes()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    usage = MemoryUsage(
+        peak_traced_bytes=max(0, peak - baseline),
+        rss_delta_bytes=max(0, rss_after - rss_before),
+    )
+    return result, usage
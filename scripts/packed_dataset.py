@@ -0,0 +1,365 @@
+"""
+Packed single-file-per-array dataset layout.
+
+Instead of one ``instance_XXXX.npz`` archive per instance, a packed dataset stores
+every matrix kind in one contiguous, uncompressed binary file under
+``<dataset>/packed/``. ``packed/index.csv`` records, for every instance, its
+dimensions and the byte offset of each of its arrays. Readers memory-map the binary
+files once and build each ``ProblemInstance`` from zero-copy views.
+
+Job counts are stored either densely (``job_counts``) or in the per-slot CSR form
+of ``SparseJobCounts`` (``job_counts_indptr``/``_indices``/``_data``); the index
+records which one via ``job_counts_format`` and ``nnz``. Each array's dtype is
+recorded per instance (``<kind>_dtype``), so instances written with compact dtypes
+(see ``compact_dtypes``) can share a file with full-width ones.
+
+Instance filenames (``instance_XXXX.npz``) are kept as the instance keys in
+``dataset.csv`` and in the index so that evaluation CSVs look the same for both
+layouts, even though no per-instance files are written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from types import TracebackType
+
+import numpy as np
+
+from compact_dtypes import compact_array, widen_array
+from simulator.problem import ProblemInstance
+from sparse_job_counts import SPARSE_JOB_COUNT_KEYS, SparseJobCounts
+
+PACKED_DIRNAME = "packed"
+PACKED_INDEX_NAME = "index.csv"
+
+ARRAY_KINDS = (
+    "capacities",
+    "requirements",
+    "job_counts",
+    *SPARSE_JOB_COUNT_KEYS,
+    "purchase_costs",
+    "running_costs",
+    "resource_weights",
+)
+ARRAY_DTYPES = {
+    "capacities": np.dtype("<i8"),
+    "requirements": np.dtype("<i8"),
+    "job_counts": np.dtype("<i8"),
+    "job_counts_indptr": np.dtype("<i8"),
+    "job_counts_indices": np.dtype("<i8"),
+    "job_counts_data": np.dtype("<i8"),
+    "purchase_costs": np.dtype("<f8"),
+    "running_costs": np.dtype("<f8"),
+    "resource_weights": np.dtype("<f8"),
+}
+DIMENSION_KEYS = ("K", "J", "M", "T")
+
+
+def packed_dir(dataset_dir: str | Path) -> Path:
+    return Path(dataset_dir) / PACKED_DIRNAME
+
+
+def is_packed_dataset(dataset_dir: str | Path) -> bool:
+    return (packed_dir(dataset_dir) / PACKED_INDEX_NAME).is_file()
+
+
+def array_shape(
+    kind: str, dims: Mapping[str, int], *, nnz: int | None = None
+) -> tuple[int, ...]:
+    """
+    Return the shape of array ``kind`` for an instance with dimensions ``dims``.
+
+    ``nnz`` is the number of stored job counts of a sparse instance, or ``None`` for
+    a dense one. Job-count arrays of the other representation have zero length.
+    """
+    K, J, M, T = (dims[key] for key in DIMENSION_KEYS)
+    sparse = nnz is not None
+    shapes = {
+        "capacities": (K, M),
+        "requirements": (K, J),
+        "job_counts": (0,) if sparse else (T, J),
+        "job_counts_indptr": (T + 1,) if sparse else (0,),
+        "job_counts_indices": (nnz,) if sparse else (0,),
+        "job_counts_data": (nnz,) if sparse else (0,),
+        "purchase_costs": (M,),
+        "running_costs": (M,),
+        "resource_weights": (K,),
+    }
+    return shapes[kind]
+
+
+def _offset_column(kind: str) -> str:
+    return f"{kind}_offset"
+
+
+def _dtype_column(kind: str) -> str:
+    return f"{kind}_dtype"
+
+
+def _index_fieldnames() -> list[str]:
+    return [
+        "filename",
+        *DIMENSION_KEYS,
+        "job_counts_format",
+        "nnz",
+        *(_offset_column(kind) for kind in ARRAY_KINDS),
+        *(_dtype_column(kind) for kind in ARRAY_KINDS),
+    ]
+
+
+class PackedDatasetWriter:
+    """
+    Append instances to a packed dataset, one instance at a time.
+
+    With ``compact=True`` every array is narrowed with ``compact_array`` before it is
+    written; otherwise arrays are stored with the widths in ``ARRAY_DTYPES``. With
+    ``append=True`` instances are added after those of an existing packed dataset.
+    """
+
+    def __init__(
+        self, dataset_dir: str | Path, *, compact: bool = False, append: bool = False
+    ) -> None:
+        self._compact = compact
+        self._path = packed_dir(dataset_dir)
+        self._path.mkdir(parents=True, exist_ok=True)
+        index_path = self._path / PACKED_INDEX_NAME
+
+        if append:
+            with index_path.open(newline="") as handle:
+                header = next(csv.reader(handle), [])
+            if header != _index_fieldnames():
+                raise ValueError(
+                    f"{index_path} was written by an incompatible version; "
+                    "regenerate the packed dataset before appending."
+                )
+
+        mode = "ab" if append else "wb"
+        self._files = {
+            kind: (self._path / f"{kind}.bin").open(mode) for kind in ARRAY_KINDS
+        }
+        self._offsets = {kind: handle.tell() for kind, handle in self._files.items()}
+        self._index_file = index_path.open("a" if append else "w", newline="")
+        self._index = csv.DictWriter(self._index_file, fieldnames=_index_fieldnames())
+        if not append:
+            self._index.writeheader()
+
+    def append(
+        self,
+        filename: str,
+        dims: Mapping[str, int],
+        arrays: Mapping[str, np.ndarray],
+    ) -> None:
+        row: dict[str, int | str] = {"filename": filename}
+        row.update({key: int(dims[key]) for key in DIMENSION_KEYS})
+
+        nnz = None
+        if "job_counts" not in arrays:
+            nnz = int(np.size(arrays["job_counts_indices"]))
+        row["job_counts_format"] = "dense" if nnz is None else "csr"
+        row["nnz"] = "" if nnz is None else nnz
+
+        for kind in ARRAY_KINDS:
+            expected_shape = array_shape(kind, dims, nnz=nnz)
+            data = np.asarray(
+                arrays.get(kind, np.empty(expected_shape)), dtype=ARRAY_DTYPES[kind]
+            )
+            if data.shape != expected_shape:
+                raise ValueError(
+                    f"{filename}: {kind} has shape {data.shape}, "
+                    f"expected {expected_shape}."
+                )
+            if self._compact:
+                data = compact_array(data)
+            data = np.ascontiguousarray(data, dtype=data.dtype.newbyteorder("<"))
+
+            # Keep every array aligned to its item size so the views stay aligned.
+            padding = -self._offsets[kind] % data.dtype.itemsize
+            self._files[kind].write(bytes(padding))
+            self._offsets[kind] += padding
+
+            row[_offset_column(kind)] = self._offsets[kind]
+            row[_dtype_column(kind)] = data.dtype.str
+            self._files[kind].write(data.tobytes())
+            self._offsets[kind] += data.nbytes
+
+        self._index.writerow(row)
+
+    def close(self) -> None:
+        for handle in self._files.values():
+            handle.close()
+        self._index_file.close()
+
+    def __enter__(self) -> PackedDatasetWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class PackedDataset:
+    """Read-only, memory-mapped view of a packed dataset."""
+
+    def __init__(self, dataset_dir: str | Path) -> None:
+        self._path = packed_dir(dataset_dir)
+        index_path = self._path / PACKED_INDEX_NAME
+        if not index_path.is_file():
+            raise FileNotFoundError(f"Missing packed dataset index: {index_path}")
+
+        self._rows: dict[str, dict[str, int]] = {}
+        self._nnz: dict[str, int | None] = {}
+        self._dtypes: dict[str, dict[str, np.dtype]] = {}
+        with index_path.open(newline="") as handle:
+            for row in csv.DictReader(handle):
+                filename = row.pop("filename")
+                sparse = row.pop("job_counts_format") == "csr"
+                nnz = row.pop("nnz")
+                self._nnz[filename] = int(nnz) if sparse else None
+                self._dtypes[filename] = {
+                    kind: np.dtype(row.pop(_dtype_column(kind), "") or default)
+                    for kind, default in ARRAY_DTYPES.items()
+                }
+                self._rows[filename] = {key: int(value) for key, value in row.items()}
+
+        self._buffers: dict[str, np.ndarray] = {}
+        for kind in ARRAY_KINDS:
+            bin_path = self._path / f"{kind}.bin"
+            if bin_path.stat().st_size == 0:
+                self._buffers[kind] = np.empty(0, dtype=np.uint8)
+            else:
+                self._buffers[kind] = np.memmap(bin_path, dtype=np.uint8, mode="r")
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, filename: object) -> bool:
+        return filename in self._rows
+
+    def entries(self) -> Iterator[tuple[str, dict[str, int]]]:
+        for filename, row in self._rows.items():
+            yield filename, {key: row[key] for key in DIMENSION_KEYS}
+
+    def arrays(self, filename: str) -> dict[str, np.ndarray]:
+        """
+        Return zero-copy, read-only views of every array of one instance.
+
+        Only the job-count arrays of the stored representation are included.
+        """
+        try:
+            row = self._rows[filename]
+        except KeyError:
+            raise KeyError(f"{filename} is not in the packed dataset.") from None
+
+        nnz = self._nnz[filename]
+        stored = set(ARRAY_KINDS) - (
+            {"job_counts"} if nnz is not None else set(SPARSE_JOB_COUNT_KEYS)
+        )
+
+        views: dict[str, np.ndarray] = {}
+        for kind in ARRAY_KINDS:
+            if kind not in stored:
+                continue
+            dtype = self._dtypes[filename][kind]
+            shape = array_shape(kind, row, nnz=nnz)
+            start = row[_offset_column(kind)]
+            stop = start + int(np.prod(shape)) * dtype.itemsize
+            views[kind] = self._buffers[kind][start:stop].view(dtype).reshape(shape)
+        return views
+
+    def job_counts(self, filename: str) -> np.ndarray | SparseJobCounts:
+        """Return the job-count matrix in its stored (dense or sparse) form."""
+        arrays = self.arrays(filename)
+        if "job_counts" in arrays:
+            return arrays["job_counts"]
+        return SparseJobCounts.from_arrays(arrays, num_jobs=self._rows[filename]["J"])
+
+    def load(self, filename: str, *, widen: bool = True) -> ProblemInstance:
+        """
+        Build a ``ProblemInstance``, densifying sparse job counts.
+
+        ``widen`` casts compact arrays back to int64/float64 for schedulers that do
+        arithmetic on them; with ``widen=False`` dense arrays stay zero-copy views.
+        """
+        arrays = self.arrays(filename)
+        if widen:
+            arrays = {kind: widen_array(array) for kind, array in arrays.items()}
+        if "job_counts" not in arrays:
+            sparse = SparseJobCounts.from_arrays(
+                arrays, num_jobs=self._rows[filename]["J"]
+            )
+            for key in SPARSE_JOB_COUNT_KEYS:
+                del arrays[key]
+            arrays["job_counts"] = sparse.to_dense()
+        return ProblemInstance(**arrays)
+
+
+def pack_dataset(
+    dataset_dir: str | Path,
+    entries: Iterable[tuple[str, Mapping[str, int]]] | None = None,
+    *,
+    compact: bool = False,
+) -> int:
+    """
+    Convert an existing per-instance ``.npz`` dataset into the packed layout.
+
+    ``entries`` defaults to the rows of ``dataset.csv``. Returns the number of
+    instances packed. The ``.npz`` files are left in place. ``compact`` narrows the
+    stored dtypes (see ``PackedDatasetWriter``).
+    """
+
+    dataset_path = Path(dataset_dir)
+    if entries is None:
+        with (dataset_path / "dataset.csv").open(newline="") as handle:
+            entries = [
+                (row["filename"], {key: int(row[key]) for key in DIMENSION_KEYS})
+                for row in csv.DictReader(handle)
+            ]
+
+    count = 0
+    with PackedDatasetWriter(dataset_path, compact=compact) as writer:
+        for filename, dims in entries:
+            with np.load(dataset_path / filename) as data:
+                writer.append(
+                    filename,
+                    dims,
+                    {kind: data[kind] for kind in ARRAY_KINDS if kind in data},
+                )
+            count += 1
+    return count
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Convert a per-instance NPZ dataset into the packed layout."
+    )
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=Path("dataset"),
+        help="Directory containing dataset.csv and NPZ instances.",
+    )
+    parser.add_argument(
+        "--compact-dtypes",
+        dest="compact_dtypes",
+        action="store_true",
+        help="Store each array with the smallest lossless integer/float dtype.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    count = pack_dataset(args.dataset, compact=args.compact_dtypes)
+    print(f"Packed {count} instances into {packed_dir(args.dataset)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,743 @@
+"""
+NumPy packing engine for the BFD, FFDNew and FFD variant schedulers.
+
+Implements the algorithms of ``chapters/method.typ``. Job types are sorted
+(``ResourceWeightSort`` for BFD and FFDNew, by a size heuristic for the FFD
+variants) and every time slot is packed separately: items of the current type
+go into an open bin when one is feasible (``SelectOpenBin`` for BFD, the first
+feasible bin otherwise), and otherwise into a new bin of the type chosen by
+``SelectNewBinType`` (BFD, FFDNew) or of the cheapest feasible type (FFD
+variants). ``PackingRules`` holds these choices per scheduler.
+
+The open bins of a slot are kept as growable arrays of residual capacities, so
+the fit counts ``q_b``, placement counts ``n_b`` and slack scores ``Phi_b`` of all
+open bins are computed in one vectorized step instead of one bin at a time. Ties
+are broken by ``(Phi_b, c^r, b)`` for open bins and by ``(Psi_i, c^p + c^r, i)``
+for new bin types, as in the pseudocode.
+
+Consecutive bins of the same type with the same contents are stored once, as a
+run with a count. The remaining items of a type often fill a long run of
+identical bins, and placing them in a run (new or already open) is one step:
+a bin that receives ``q_b`` items cannot take another item of the type, and the
+next bin of the run stays the selected one while it also receives ``q_b`` items.
+The scans then cost time in the number of runs rather than the number of bins,
+and the decisions are those of the bin-by-bin pseudocode.
+
+A new bin starts empty, so its fit count ``q_i`` depends only on the bin type
+and the job type, and ``Psi_i`` only on those and the number of remaining items
+``eta``. ``SelectNewBinType`` is therefore evaluated once per instance, for every
+job type and every ``eta`` up to the smaller of its largest fit count (more items
+choose the same bin) and its largest job count (more items never occur), and
+opening a bin is a table lookup.
+
+Slots only interact through ``x = max_t X_t``, so ``pack`` can also split them
+across a process pool. The pool (``SlotPool``) lives as long as the process, and
+the instance arrays are placed in shared memory once per instance instead of
+being pickled for every worker, so repeated runs on an instance only pay for
+packing. A slot whose job counts ``l_t`` equal those of an earlier slot reuses
+that slot's packing instead of being packed again; ``PackingResult`` counts
+these cache hits.
+
+Time spent sorting job types, selecting open bins and selecting new bin types
+(including building the table) is reported to ``phase_timing`` as the ``sort``,
+``open_bin`` and ``new_bin`` phases. Slots packed by pool workers are not timed,
+since the phase timer only sees this process.
+
+The schedulers are registered in ``ENGINE_SCHEDULERS`` under ``*_engine`` names,
+next to the simulator's own schedulers.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+from typing import Literal
+
+import numpy as np
+
+from simulator.problem import ProblemInstance
+from phase_timing import active_timer, phase
+
+JobOrder = Literal["weighted", "lex", "sum", "prod", "max", "l2"]
+OpenBinRule = Literal["best_fit", "first_fit"]
+NewBinRule = Literal["min_slack", "cheapest"]
+
+INITIAL_BIN_CAPACITY = 16
+# Chunks of time slots per pool worker, to even out slots of different sizes.
+SLOT_CHUNKS_PER_WORKER = 4
+SHARED_ALIGNMENT = 64
+# Instances a slot pool keeps in shared memory, least recently used dropped first.
+SHARED_INSTANCES_KEPT = 8
+
+# Job type sizes from the (K, J) demands and alpha; larger sizes pack first.
+_JOB_SIZES: dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    "weighted": lambda requirements, alpha: requirements.T @ alpha,
+    "sum": lambda requirements, alpha: requirements.sum(axis=0),
+    "prod": lambda requirements, alpha: requirements.prod(axis=0),
+    "max": lambda requirements, alpha: requirements.max(axis=0),
+    "l2": lambda requirements, alpha: np.linalg.norm(requirements, axis=0),
+}
+
+
+@dataclass(frozen=True)
+class PackingRules:
+    """Job type order and bin selection rules of a greedy packer."""
+
+    job_order: JobOrder
+    open_bin: OpenBinRule
+    new_bin: NewBinRule
+
+
+def job_type_order(
+    requirements: np.ndarray, alpha: np.ndarray, job_order: JobOrder
+) -> np.ndarray:
+    """Packing order of the job types in the (K, J) ``requirements``.
+
+    Decreasing size, or decreasing demand vectors compared from the first resource
+    for ``"lex"``; ties keep index order.
+    """
+    if job_order == "lex":
+        return np.lexsort(-requirements[::-1])
+    return np.argsort(-_JOB_SIZES[job_order](requirements, alpha), kind="stable")
+
+
+@dataclass(frozen=True)
+class SlotPacking:
+    """Bins of one time slot, as runs of identical bins, and the items placed in them."""
+
+    # Type and length of each run, in bin index order.
+    bin_types: np.ndarray
+    bin_counts: np.ndarray
+    # Rows (first bin, bins, job type, count) in placement order: count items of
+    # the job type in each of the bins. Job types are original indices.
+    placements: np.ndarray
+
+    def machine_counts(self, num_types: int) -> np.ndarray:
+        """Number of bins of each type."""
+        counts = np.zeros(num_types, dtype=np.int64)
+        np.add.at(counts, self.bin_types, self.bin_counts)
+        return counts
+
+    def per_bin(self) -> tuple[np.ndarray, np.ndarray]:
+        """Type of every bin and (bin, job type, count) rows for every placement."""
+        first, bins, jobs, counts = self.placements.T
+        offsets = np.arange(bins.sum()) - np.repeat(np.cumsum(bins) - bins, bins)
+        placements = np.column_stack(
+            [
+                np.repeat(first, bins) + offsets,
+                np.repeat(jobs, bins),
+                np.repeat(counts, bins),
+            ]
+        )
+        return np.repeat(self.bin_types, self.bin_counts), placements
+
+
+@dataclass(frozen=True)
+class PackingResult:
+    total_cost: float
+    machine_vector: np.ndarray
+    # X, the number of bins of each type per time slot, shape (M, T).
+    slot_machines: np.ndarray
+    packings: tuple[SlotPacking, ...]
+    # Slots that reused the packing of an earlier slot with the same job counts,
+    # and slots that were packed.
+    slot_cache_hits: int = 0
+    slot_cache_misses: int = 0
+
+    def validate(self, problem: ProblemInstance) -> None:
+        """Raise ValueError unless the packing is feasible and its cost matches."""
+        capacities = np.asarray(problem.capacities)
+        requirements = np.asarray(problem.requirements)
+        job_counts = np.atleast_2d(np.asarray(problem.job_counts))
+        M = capacities.shape[1]
+        J = requirements.shape[1]
+
+        for t, packing in enumerate(self.packings):
+            bin_types, placements = packing.per_bin()
+            contents = np.zeros((bin_types.size, J), dtype=np.int64)
+            bins, jobs, counts = placements.T
+            np.add.at(contents, (bins, jobs), counts)
+            if not np.array_equal(contents.sum(axis=0), job_counts[t]):
+                raise ValueError(f"Slot {t} does not place every job exactly once.")
+            loads = contents @ requirements.T
+            if np.any(loads > capacities.T[bin_types]):
+                raise ValueError(f"Slot {t} has a bin over its capacity.")
+            if not np.array_equal(packing.machine_counts(M), self.slot_machines[:, t]):
+                raise ValueError(f"Slot {t} bin counts do not match slot_machines.")
+
+        if not np.array_equal(self.machine_vector, self.slot_machines.max(axis=1)):
+            raise ValueError("machine_vector is not the maximum over time slots.")
+        expected = packing_cost(problem, self.slot_machines)
+        if not np.isclose(self.total_cost, expected):
+            raise ValueError(f"total_cost {self.total_cost} != {expected}.")
+
+
+def packing_cost(problem: ProblemInstance, slot_machines: np.ndarray) -> float:
+    """Purchase cost of ``max_t X`` plus the running cost of every slot's bins."""
+    purchase_costs = np.asarray(problem.purchase_costs, dtype=float)
+    running_costs = np.asarray(problem.running_costs, dtype=float)
+    return float(
+        slot_machines.max(axis=1) @ purchase_costs
+        + slot_machines.sum(axis=1) @ running_costs
+    )
+
+
+@dataclass(frozen=True)
+class _Instance:
+    """Instance arrays in the layout the packing loop uses."""
+
+    # (M, K) bin type capacities.
+    capacities: np.ndarray
+    # (J, K) job type demands, in packing order.
+    requirements: np.ndarray
+    # Original index of each job type in packing order.
+    order: np.ndarray
+    # (J, T) job counts, in packing order.
+    job_counts: np.ndarray
+    alpha: np.ndarray
+    purchase_costs: np.ndarray
+    running_costs: np.ndarray
+    new_bins: _NewBinTable
+
+    @classmethod
+    def from_problem(cls, problem: ProblemInstance, rules: PackingRules) -> _Instance:
+        alpha = np.asarray(problem.resource_weights, dtype=float)
+        requirements = np.asarray(problem.requirements, dtype=np.int64)
+        with phase("sort"):
+            order = job_type_order(requirements, alpha, rules.job_order)
+        job_counts = np.atleast_2d(np.asarray(problem.job_counts, dtype=np.int64))
+        capacities = np.ascontiguousarray(
+            np.asarray(problem.capacities, dtype=np.int64).T
+        )
+        requirements = np.ascontiguousarray(requirements.T[order])
+        job_counts = np.ascontiguousarray(job_counts.T[order])
+        purchase_costs = np.asarray(problem.purchase_costs, dtype=float)
+        running_costs = np.asarray(problem.running_costs, dtype=float)
+        # Building the table is most of the work of selecting new bin types.
+        with phase("new_bin"):
+            new_bins = _NewBinTable.build(
+                capacities,
+                requirements,
+                alpha,
+                purchase_costs,
+                running_costs,
+                job_counts.max(axis=1, initial=0),
+                rules.new_bin,
+            )
+        return cls(
+            capacities=capacities,
+            requirements=requirements,
+            order=order,
+            job_counts=job_counts,
+            alpha=alpha,
+            purchase_costs=purchase_costs,
+            running_costs=running_costs,
+            new_bins=new_bins,
+        )
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        """All arrays by name, the new bin table's prefixed with ``new_bins.``."""
+        arrays = {
+            field.name: getattr(self, field.name)
+            for field in fields(self)
+            if field.name != "new_bins"
+        }
+        for field in fields(self.new_bins):
+            arrays[f"new_bins.{field.name}"] = getattr(self.new_bins, field.name)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray]) -> _Instance:
+        table = {
+            name.removeprefix("new_bins."): array
+            for name, array in arrays.items()
+            if name.startswith("new_bins.")
+        }
+        return cls(
+            **{
+                name: array
+                for name, array in arrays.items()
+                if not name.startswith("new_bins.")
+            },
+            new_bins=_NewBinTable(**table),
+        )
+
+
+@dataclass(frozen=True)
+class _SharedArrays:
+    """Where arrays copied into a shared memory block are."""
+
+    name: str
+    # (array name, dtype, shape, byte offset) of each array.
+    layout: tuple[tuple[str, str, tuple[int, ...], int], ...]
+
+    @classmethod
+    def create(
+        cls, arrays: Mapping[str, np.ndarray]
+    ) -> tuple[SharedMemory, _SharedArrays]:
+        layout = []
+        size = 0
+        for name, array in arrays.items():
+            offset = -(-size // SHARED_ALIGNMENT) * SHARED_ALIGNMENT
+            layout.append((name, array.dtype.str, array.shape, offset))
+            size = offset + array.nbytes
+        shm = SharedMemory(create=True, size=max(size, 1))
+        shared = cls(name=shm.name, layout=tuple(layout))
+        for name, view in shared.views(shm).items():
+            view[...] = arrays[name]
+        return shm, shared
+
+    def views(self, shm: SharedMemory) -> dict[str, np.ndarray]:
+        return {
+            name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            for name, dtype, shape, offset in self.layout
+        }
+
+
+class _BinRuns:
+    """A slot's open bins as runs of consecutive identical bins.
+
+    A run is ``count`` bins of one type with the same contents, starting at bin
+    index ``start``. Runs are stored in creation order, which is not bin index
+    order once a run is split, so ties are broken on ``start``.
+    """
+
+    def __init__(self, num_resources: int) -> None:
+        self._residual = np.empty((INITIAL_BIN_CAPACITY, num_resources), np.int64)
+        self._types = np.empty(INITIAL_BIN_CAPACITY, np.int64)
+        self._starts = np.empty(INITIAL_BIN_CAPACITY, np.int64)
+        self._counts = np.empty(INITIAL_BIN_CAPACITY, np.int64)
+        self.size = 0
+        self.num_bins = 0
+
+    @property
+    def residual(self) -> np.ndarray:
+        return self._residual[: self.size]
+
+    @property
+    def types(self) -> np.ndarray:
+        return self._types[: self.size]
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self._starts[: self.size]
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self._counts[: self.size]
+
+    def _append(
+        self, bin_type: int, start: int, count: int, residual: np.ndarray
+    ) -> None:
+        if self.size == self._types.size:
+            self._residual = np.concatenate([self._residual, self._residual])
+            self._types = np.concatenate([self._types, self._types])
+            self._starts = np.concatenate([self._starts, self._starts])
+            self._counts = np.concatenate([self._counts, self._counts])
+        self._residual[self.size] = residual
+        self._types[self.size] = bin_type
+        self._starts[self.size] = start
+        self._counts[self.size] = count
+        self.size += 1
+
+    def open(self, bin_type: int, residual: np.ndarray, count: int) -> int:
+        """Open ``count`` bins with the given residual capacity; return the first."""
+        start = self.num_bins
+        self._append(bin_type, start, count, residual)
+        self.num_bins += count
+        return start
+
+    def fill(self, run: int, count: int, used: np.ndarray) -> int:
+        """Use ``used`` capacity in the first ``count`` bins of ``run``; return the first."""
+        if count < self._counts[run]:
+            self._append(
+                int(self._types[run]),
+                int(self._starts[run]) + count,
+                int(self._counts[run]) - count,
+                self._residual[run],
+            )
+            self._counts[run] = count
+        self._residual[run] -= used
+        return int(self._starts[run])
+
+
+def _slack_scores(
+    capacity: np.ndarray, placed: np.ndarray, demand: np.ndarray, alpha: np.ndarray
+) -> np.ndarray:
+    """Weighted squared slack ``sum_k alpha_k u_k^2`` with ``u = z - n r``."""
+    slack = capacity - placed[..., None] * demand
+    return (slack * slack * alpha).sum(axis=-1)
+
+
+def _fit_matrix(capacities: np.ndarray, requirements: np.ndarray) -> np.ndarray:
+    """(J, M) number of items of each job type that fit in an empty bin of each type.
+
+    Zero-demand job types get 0; the packing loop handles them separately.
+    """
+    positive = requirements > 0
+    per_resource = np.where(
+        positive[:, None, :],
+        capacities[None, :, :] // np.maximum(requirements, 1)[:, None, :],
+        np.iinfo(np.int64).max,
+    )
+    fits = per_resource.min(axis=2)
+    fits[~positive.any(axis=1)] = 0
+    return fits
+
+
+@dataclass(frozen=True)
+class _NewBinTable:
+    """``SelectNewBinType`` for every job type and number of remaining items."""
+
+    # (J, M) fit counts q of each job type in an empty bin of each type.
+    fits: np.ndarray
+    # Largest fit count per job type; more remaining items choose the same bin.
+    max_fits: np.ndarray
+    # (J, N) bin type and item count chosen for eta = n + 1 remaining items, for
+    # eta up to min(max_fits, largest job count) of each job type.
+    bin_types: np.ndarray
+    placed: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        capacities: np.ndarray,
+        requirements: np.ndarray,
+        alpha: np.ndarray,
+        purchase_costs: np.ndarray,
+        running_costs: np.ndarray,
+        max_counts: np.ndarray,
+        rule: NewBinRule,
+    ) -> _NewBinTable:
+        fits = _fit_matrix(capacities, requirements)
+        max_fits = fits.max(axis=1, initial=0)
+        # _select_new_bin_type looks up at most min(eta, max_fits) items.
+        table_sizes = np.minimum(max_fits, max_counts)
+        J = requirements.shape[0]
+        N = int(table_sizes.max(initial=0))
+        bin_types = np.full((J, N), -1, dtype=np.int64)
+        placed = np.zeros((J, N), dtype=np.int64)
+        marginal = purchase_costs + running_costs
+
+        for j in np.flatnonzero(table_sizes):
+            feasible = np.flatnonzero(fits[j] >= 1)
+            eta = np.arange(1, table_sizes[j] + 1)
+            # (eta, feasible types) items placed in a new bin of each type.
+            counts = np.minimum(fits[j, feasible], eta[:, None])
+            index = np.broadcast_to(feasible, counts.shape)
+            purchase = purchase_costs[feasible]
+            if rule == "cheapest":
+                keys = (index, np.broadcast_to(purchase, counts.shape))
+            else:
+                slack = _slack_scores(
+                    capacities[feasible], counts, requirements[j], alpha
+                )
+                psi = np.divide(
+                    slack, purchase, out=np.zeros_like(slack), where=purchase > 0
+                )
+                keys = (
+                    index,
+                    np.broadcast_to(marginal[feasible], psi.shape),
+                    psi,
+                )
+            best = np.lexsort(keys, axis=-1)[:, 0]
+            bin_types[j, : eta.size] = feasible[best]
+            placed[j, : eta.size] = counts[np.arange(eta.size), best]
+
+        return cls(fits=fits, max_fits=max_fits, bin_types=bin_types, placed=placed)
+
+
+def _select_open_bin(
+    bins: _BinRuns,
+    demand: np.ndarray,
+    positive: np.ndarray,
+    eta: int,
+    instance: _Instance,
+    rule: OpenBinRule,
+) -> tuple[int, int, int] | None:
+    """Selected run, items placed per bin, and number of bins that receive them."""
+    if bins.size == 0:
+        return None
+    residual = bins.residual
+    fits = np.min(residual[:, positive] // demand[positive], axis=1)
+    feasible = np.flatnonzero(fits >= 1)
+    if feasible.size == 0:
+        return None
+    placed = np.minimum(fits[feasible], eta)
+    if rule == "first_fit":
+        best = int(np.argmin(bins.starts[feasible]))
+    else:
+        phi = _slack_scores(residual[feasible], placed, demand, instance.alpha)
+        running = instance.running_costs[bins.types[feasible]]
+        best = np.lexsort((bins.starts[feasible], running, phi))[0]
+    run = int(feasible[best])
+    n = int(placed[best])
+    # With alpha >= 0, a smaller eta never lowers Phi of the other runs, so the
+    # next bin of the run is selected again while it receives n items.
+    return run, n, min(int(bins.counts[run]), eta // n)
+
+
+def _select_new_bin_type(
+    j: int, eta: int, instance: _Instance
+) -> tuple[int, int, int] | None:
+    """Bin type, items placed per bin, and number of such bins to open."""
+    table = instance.new_bins
+    max_fits = int(table.max_fits[j])
+    n = min(eta, max_fits)
+    if n == 0:
+        return None
+    bin_type = int(table.bin_types[j, n - 1])
+    placed = int(table.placed[j, n - 1])
+    # Every eta >= max_fits selects the same bin type.
+    repeat = (eta - max_fits) // placed + 1 if eta >= max_fits else 1
+    return bin_type, placed, repeat
+
+
+def _pack_slot(
+    counts: np.ndarray, instance: _Instance, rule: OpenBinRule
+) -> SlotPacking:
+    bins = _BinRuns(instance.capacities.shape[1])
+    placements: list[tuple[int, int, int, int]] = []
+    # Selection times, reported once per slot since ``phase`` costs more than
+    # many of the selections it would time.
+    open_bin_ns = new_bin_ns = 0
+    for j in np.flatnonzero(counts):
+        demand = instance.requirements[j]
+        positive = demand > 0
+        job = int(instance.order[j])
+        eta = int(counts[j])
+
+        if not positive.any():
+            # Zero-demand job type: everything goes into the first open bin, or
+            # into a new bin of the cheapest type.
+            if bins.size == 0:
+                cheapest = int(np.argmin(instance.purchase_costs))
+                bins.open(cheapest, instance.capacities[cheapest], 1)
+            first_run = int(np.argmin(bins.starts))
+            placements.append((bins.fill(first_run, 1, demand), 1, job, eta))
+            continue
+
+        while eta > 0:
+            start = time.perf_counter_ns()
+            selected = _select_open_bin(bins, demand, positive, eta, instance, rule)
+            selected_ns = time.perf_counter_ns()
+            open_bin_ns += selected_ns - start
+            if selected is None:
+                new_bin = _select_new_bin_type(j, eta, instance)
+                new_bin_ns += time.perf_counter_ns() - selected_ns
+                if new_bin is None:
+                    raise ValueError(f"Job type {job} does not fit any machine type.")
+                bin_type, placed, repeat = new_bin
+                b = bins.open(
+                    bin_type, instance.capacities[bin_type] - placed * demand, repeat
+                )
+            else:
+                run, placed, repeat = selected
+                b = bins.fill(run, repeat, placed * demand)
+            placements.append((b, repeat, job, placed))
+            eta -= repeat * placed
+
+    timer = active_timer()
+    if timer is not None:
+        timer.add("open_bin", open_bin_ns)
+        timer.add("new_bin", new_bin_ns)
+    order = np.argsort(bins.starts)
+    return SlotPacking(
+        bin_types=bins.types[order],
+        bin_counts=bins.counts[order],
+        placements=np.asarray(placements, dtype=np.int64).reshape(-1, 4),
+    )
+
+
+def _pack_slots(
+    instance: _Instance, rule: OpenBinRule, slots: Iterable[int]
+) -> list[SlotPacking]:
+    return [_pack_slot(instance.job_counts[:, t], instance, rule) for t in slots]
+
+
+# Shared memory blocks attached by a slot pool worker, least recently used first.
+_attached: OrderedDict[str, tuple[SharedMemory, _Instance]] = OrderedDict()
+
+
+def _attached_instance(shared: _SharedArrays) -> _Instance:
+    entry = _attached.get(shared.name)
+    if entry is None:
+        shm = SharedMemory(name=shared.name)
+        arrays = shared.views(shm)
+        for array in arrays.values():
+            array.flags.writeable = False
+        entry = _attached[shared.name] = (shm, _Instance.from_arrays(arrays))
+        del arrays
+        while len(_attached) > SHARED_INSTANCES_KEPT:
+            # The instance's views must go before the block can be closed.
+            old_shm, old_instance = _attached.popitem(last=False)[1]
+            del old_instance
+            old_shm.close()
+    _attached.move_to_end(shared.name)
+    return entry[1]
+
+
+def _pack_worker_slots(
+    shared: _SharedArrays, rule: OpenBinRule, slots: np.ndarray
+) -> list[SlotPacking]:
+    return _pack_slots(_attached_instance(shared), rule, slots)
+
+
+class SlotPool:
+    """
+    Process pool that packs time slots, with instances in shared memory.
+
+    An instance is copied into shared memory the first time it is packed with
+    some rules, and reused while it is among the ``SHARED_INSTANCES_KEPT`` most
+    recently packed (instances are recognized by identity, so the pool keeps a
+    reference to them). Workers attach to each block once.
+    """
+
+    def __init__(self, workers: int | None) -> None:
+        self.max_workers = workers or os.cpu_count() or 1
+        self.pid = os.getpid()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._instances: OrderedDict[
+            tuple[int, PackingRules],
+            tuple[ProblemInstance, _Instance, SharedMemory, _SharedArrays],
+        ] = OrderedDict()
+
+    def instance(
+        self, problem: ProblemInstance, rules: PackingRules
+    ) -> tuple[_Instance, _SharedArrays]:
+        key = (id(problem), rules)
+        entry = self._instances.get(key)
+        if entry is None:
+            instance = _Instance.from_problem(problem, rules)
+            shm, shared = _SharedArrays.create(instance.arrays())
+            entry = self._instances[key] = (problem, instance, shm, shared)
+            while len(self._instances) > SHARED_INSTANCES_KEPT:
+                _, _, old_shm, _ = self._instances.popitem(last=False)[1]
+                old_shm.close()
+                old_shm.unlink()
+        self._instances.move_to_end(key)
+        return entry[1], entry[3]
+
+    def pack_slots(
+        self, shared: _SharedArrays, rule: OpenBinRule, slots: np.ndarray
+    ) -> list[SlotPacking]:
+        chunks = np.array_split(
+            slots, min(slots.size, SLOT_CHUNKS_PER_WORKER * self.max_workers)
+        )
+        # ``map`` returns the chunks in order.
+        return [
+            packing
+            for packings in self._executor.map(
+                _pack_worker_slots, repeat(shared), repeat(rule), chunks
+            )
+            for packing in packings
+        ]
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        for _, _, shm, _ in self._instances.values():
+            shm.close()
+            shm.unlink()
+        self._instances.clear()
+
+
+_slot_pools: dict[int, SlotPool] = {}
+
+
+def slot_pool(workers: int | None) -> SlotPool:
+    """This process's pool of ``workers`` processes, started on first use."""
+    max_workers = workers or os.cpu_count() or 1
+    pool = _slot_pools.get(max_workers)
+    # A forked child cannot use its parent's pool.
+    if pool is None or pool.pid != os.getpid():
+        pool = _slot_pools[max_workers] = SlotPool(max_workers)
+    return pool
+
+
+@atexit.register
+def close_slot_pools() -> None:
+    """Shut down this process's slot pools and free their shared memory."""
+    for max_workers, pool in list(_slot_pools.items()):
+        if pool.pid == os.getpid():
+            pool.close()
+        del _slot_pools[max_workers]
+
+
+def pack(
+    problem: ProblemInstance, *, rules: PackingRules, workers: int | None = 1
+) -> PackingResult:
+    """
+    Pack every time slot of ``problem`` under ``rules``.
+
+    With ``workers`` other than 1 the slots are split into chunks packed by the
+    process's ``slot_pool`` (``None`` or 0 uses all CPU cores). Each slot is packed
+    exactly as in-process, so the result does not depend on ``workers``. The pool
+    and the instance's shared memory block are reused by later calls, so only the
+    first run on an instance pays for them.
+
+    Only the first slot with a given job count vector is packed; later slots with
+    the same vector share its ``SlotPacking``.
+    """
+    if workers is not None and workers < 0:
+        raise ValueError("workers must be non-negative.")
+    pool = None
+    if workers == 1:
+        instance = _Instance.from_problem(problem, rules)
+    else:
+        pool = slot_pool(workers)
+        instance, shared = pool.instance(problem, rules)
+    M = instance.capacities.shape[0]
+    T = instance.job_counts.shape[1]
+
+    # First slot with the same job counts as each slot.
+    first_slots: dict[bytes, int] = {}
+    sources = [
+        first_slots.setdefault(instance.job_counts[:, t].tobytes(), t) for t in range(T)
+    ]
+    packed_slots = np.fromiter(first_slots.values(), dtype=np.int64)
+    if pool is None or packed_slots.size <= 1:
+        packed = _pack_slots(instance, rules.open_bin, packed_slots)
+    else:
+        packed = pool.pack_slots(shared, rules.open_bin, packed_slots)
+    packing_by_slot = dict(zip(packed_slots.tolist(), packed, strict=True))
+    packings = [packing_by_slot[source] for source in sources]
+
+    slot_machines = np.zeros((M, T), dtype=np.int64)
+    for t, packing in enumerate(packings):
+        slot_machines[:, t] = packing.machine_counts(M)
+
+    return PackingResult(
+        total_cost=packing_cost(problem, slot_machines),
+        machine_vector=slot_machines.max(axis=1),
+        slot_machines=slot_machines,
+        packings=tuple(packings),
+        slot_cache_hits=T - packed_slots.size,
+        slot_cache_misses=packed_slots.size,
+    )
+
+
+def _ffd_rules(job_order: JobOrder) -> PackingRules:
+    return PackingRules(job_order=job_order, open_bin="first_fit", new_bin="cheapest")
+
+
+# Engine schedulers by name; run them with ``pack(problem, rules=...)``.
+ENGINE_SCHEDULERS: dict[str, PackingRules] = {
+    "bfd_engine": PackingRules(
+        job_order="weighted", open_bin="best_fit", new_bin="min_slack"
+    ),
+    "ffd_new_engine": PackingRules(
+        job_order="weighted", open_bin="first_fit", new_bin="min_slack"
+    ),
+    "ffd_engine": _ffd_rules("lex"),
+    "ffd_sum_engine": _ffd_rules("sum"),
+    "ffd_prod_engine": _ffd_rules("prod"),
+    "ffd_max_engine": _ffd_rules("max"),
+    "ffd_l2_engine": _ffd_rules("l2"),
+}
@@ -11,6 +11,7 @@ import numpy as np
 
 from eval_utils import (
     display_scheduler_name,
+    load_total_costs,
     normalize_scheduler_name,
     parse_scheduler_list,
     scheduler_output_filename,
@@ -44,30 +45,8 @@ def _discover_results(
 
 
 def _load_costs(csv_path: Path) -> dict[str, float]:
-    costs: dict[str, float] = {}
-    with csv_path.open(newline="") as handle:
-        reader = csv.DictReader(handle)
-        if not reader.fieldnames:
-            raise ValueError(f"{csv_path} has no header row.")
-        required = {"filename", "total_cost"}
-        missing = required - set(reader.fieldnames)
-        if missing:
-            raise ValueError(f"{csv_path} missing required columns: {sorted(missing)}.")
-        for row in reader:
-            filename = row["filename"]
-            if filename in costs:
-                raise ValueError(
-                    f"{csv_path} has duplicate filename entry: {filename}."
-                )
-            try:
-                costs[filename] = float(row["total_cost"])
-            except ValueError as exc:
-                raise ValueError(
-                    f"{csv_path} has invalid total_cost for {filename}: {row['total_cost']}"
-                ) from exc
-    if not costs:
-        raise ValueError(f"{csv_path} has no rows to evaluate.")
-    return costs
+    # Replicates of a stochastic scheduler count with their mean cost.
+    return load_total_costs(csv_path, duplicate_policy="error")
 
 
 def _ensure_matching_instances(
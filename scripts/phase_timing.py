@@ -0,0 +1,92 @@
+"""
+Per-phase wall-clock accounting for evaluation runs.
+
+``eval.py`` activates a ``PhaseTimer`` while a scheduler runs. Scheduler code can
+report its internal phases (e.g. sorting, open-bin selection, new-bin selection)
+without depending on the evaluation pipeline:
+
+    with phase("sort"):
+        ...
+
+``phase`` is a no-op when no timer is active. Schedulers may instead attach a
+``phase_times`` mapping (phase name -> seconds) to the returned schedule; both are
+reported in the results.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+NS_PER_SEC = 1e9
+
+_active_timer: ContextVar[PhaseTimer | None] = ContextVar(
+    "active_phase_timer", default=None
+)
+
+
+class PhaseTimer:
+    """Accumulate wall time per named phase."""
+
+    def __init__(self) -> None:
+        self._totals_ns: dict[str, int] = {}
+
+    def add(self, name: str, elapsed_ns: int) -> None:
+        self._totals_ns[name] = self._totals_ns.get(name, 0) + elapsed_ns
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter_ns() - start)
+
+    def clear(self) -> None:
+        self._totals_ns.clear()
+
+    def seconds(self) -> dict[str, float]:
+        return {name: ns / NS_PER_SEC for name, ns in self._totals_ns.items()}
+
+    @contextmanager
+    def activate(self) -> Iterator[PhaseTimer]:
+        """Make this timer the target of ``phase`` in the current context."""
+        token = _active_timer.set(self)
+        try:
+            yield self
+        finally:
+            _active_timer.reset(token)
+
+
+def active_timer() -> PhaseTimer | None:
+    """
+    The active timer, for hot loops that accumulate phase times themselves and
+    ``add`` them once instead of entering ``phase`` on every step.
+    """
+    return _active_timer.get()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as ``name`` on the active timer, if any."""
+    timer = _active_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
+
+
+def format_phases(phases: Mapping[str, float]) -> str:
+    """Serialize phase times as ``name=seconds`` pairs for a CSV cell."""
+    return " ".join(f"{name}={seconds!r}" for name, seconds in sorted(phases.items()))
+
+
+def parse_phases(value: str) -> dict[str, float]:
+    phases: dict[str, float] = {}
+    for item in value.split():
+        name, _, seconds = item.partition("=")
+        phases[name] = float(seconds)
+    return phases
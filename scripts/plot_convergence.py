@@ -0,0 +1,396 @@
+"""
+Summarize and plot the convergence of iterative schedulers on a dataset.
+
+Reads the ``trace_<name>.csv`` files written by ``eval.py --trace-convergence``.
+Each run's incumbent cost is compared with the best final cost any traced run
+reached on the same instance. The plot shows the median gap (with the
+interquartile range) against elapsed time or iteration. The summary CSV reports
+when runs last improved and when they came within ``--tolerance`` of their own
+final cost, which helps to choose an iteration count.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from eval_utils import (
+    display_scheduler_name,
+    normalize_scheduler_name,
+    parse_scheduler_list,
+    trace_output_filename,
+)
+
+SIG_FIGS = 4
+GRID_POINTS = 200
+X_AXES = {"time": "elapsed_sec", "iteration": "iteration"}
+
+
+@dataclass(frozen=True)
+class RunTrace:
+    filename: str
+    iterations: int
+    iteration: np.ndarray
+    elapsed_sec: np.ndarray
+    cost: np.ndarray
+
+    def first_within(self, tolerance: float) -> int:
+        """Index of the first incumbent within ``tolerance`` of the final cost."""
+        return int(np.argmax(self.cost <= self.cost[-1] * (1 + tolerance)))
+
+
+@dataclass(frozen=True)
+class ConvergenceSummary:
+    algorithm: str
+    runs: int
+    iterations: int
+    median_final_gap_pct: float
+    median_last_improvement_iteration: float
+    median_last_improvement_sec: float
+    median_within_tol_iteration: float
+    median_within_tol_sec: float
+
+
+def _fmt_sig(value: float) -> str:
+    if not np.isfinite(value):
+        return str(value)
+    return f"{value:.{SIG_FIGS}g}"
+
+
+def _discover_algorithms(results_dir: Path) -> list[str]:
+    if not results_dir.is_dir():
+        raise FileNotFoundError(f"Missing results directory: {results_dir}")
+    algorithms = sorted(
+        normalize_scheduler_name(path.stem.removeprefix("trace_"))
+        for path in results_dir.glob("trace_*.csv")
+        if path.is_file()
+    )
+    if not algorithms:
+        raise FileNotFoundError(f"No trace_*.csv files found in {results_dir}")
+    return algorithms
+
+
+def _load_traces(csv_path: Path) -> list[RunTrace]:
+    points: dict[tuple[str, str, str, str], list[tuple[int, float, float]]] = (
+        defaultdict(list)
+    )
+    with csv_path.open(newline="") as handle:
+        reader = csv.DictReader(handle)
+        required = {
+            "filename",
+            "iterations",
+            "seed",
+            "iteration",
+            "elapsed_sec",
+            "cost",
+        }
+        missing = required - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{csv_path} missing required columns: {sorted(missing)}.")
+        for row in reader:
+            run_key = (
+                row["filename"],
+                row["iterations"],
+                row["seed"],
+                # Traces written before replicates existed have one run each.
+                row.get("replicate") or "0",
+            )
+            points[run_key].append(
+                (int(row["iteration"]), float(row["elapsed_sec"]), float(row["cost"]))
+            )
+
+    traces: list[RunTrace] = []
+    for (filename, iterations, _, _), run_points in points.items():
+        iteration, elapsed_sec, cost = (
+            np.asarray(column) for column in zip(*run_points)
+        )
+        order = np.argsort(elapsed_sec, kind="stable")
+        traces.append(
+            RunTrace(
+                filename=filename,
+                iterations=int(iterations),
+                iteration=iteration[order],
+                elapsed_sec=elapsed_sec[order],
+                cost=cost[order],
+            )
+        )
+    return traces
+
+
+def _reference_costs(traces: dict[str, list[RunTrace]]) -> dict[str, float]:
+    """Best final cost per instance over all traced runs."""
+    best: dict[str, float] = {}
+    for algorithm_traces in traces.values():
+        for trace in algorithm_traces:
+            final = float(trace.cost[-1])
+            best[trace.filename] = min(best.get(trace.filename, final), final)
+    return best
+
+
+def _gap_curves(
+    traces: list[RunTrace],
+    reference: dict[str, float],
+    *,
+    x_axis: str,
+    grid: np.ndarray,
+) -> np.ndarray:
+    """Relative gap of each run's incumbent at every grid point; NaN before the first."""
+    column = X_AXES[x_axis]
+    gaps = np.full((len(traces), grid.size), np.nan)
+    for row, trace in enumerate(traces):
+        x = getattr(trace, column)
+        index = np.searchsorted(x, grid, side="right") - 1
+        has_incumbent = index >= 0
+        incumbent = trace.cost[np.maximum(index, 0)]
+        gaps[row, has_incumbent] = (
+            incumbent[has_incumbent] / reference[trace.filename] - 1.0
+        )
+    return gaps
+
+
+def _grid(traces: dict[str, list[RunTrace]], *, x_axis: str) -> np.ndarray:
+    column = X_AXES[x_axis]
+    values = np.concatenate(
+        [getattr(trace, column) for runs in traces.values() for trace in runs]
+    )
+    if x_axis == "iteration":
+        return np.arange(values.min(), values.max() + 1)
+    positive = values[values > 0]
+    if positive.size == 0:
+        return np.zeros(1)
+    return np.geomspace(positive.min(), values.max(), GRID_POINTS)
+
+
+def _summarize(
+    algorithm: str,
+    traces: list[RunTrace],
+    reference: dict[str, float],
+    *,
+    tolerance: float,
+) -> ConvergenceSummary:
+    final_gaps = [trace.cost[-1] / reference[trace.filename] - 1.0 for trace in traces]
+    within = [trace.first_within(tolerance) for trace in traces]
+    return ConvergenceSummary(
+        algorithm=algorithm,
+        runs=len(traces),
+        iterations=max(trace.iterations for trace in traces),
+        median_final_gap_pct=100.0 * float(np.median(final_gaps)),
+        median_last_improvement_iteration=float(
+            np.median([trace.iteration[-1] for trace in traces])
+        ),
+        median_last_improvement_sec=float(
+            np.median([trace.elapsed_sec[-1] for trace in traces])
+        ),
+        median_within_tol_iteration=float(
+            np.median(
+                [
+                    trace.iteration[idx]
+                    for trace, idx in zip(traces, within, strict=True)
+                ]
+            )
+        ),
+        median_within_tol_sec=float(
+            np.median(
+                [
+                    trace.elapsed_sec[idx]
+                    for trace, idx in zip(traces, within, strict=True)
+                ]
+            )
+        ),
+    )
+
+
+def _write_summary_csv(
+    path: Path, rows: list[ConvergenceSummary], *, tolerance: float
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(
+            handle,
+            fieldnames=[
+                "algorithm",
+                "runs",
+                "iterations",
+                "median_final_gap_pct",
+                "median_last_improvement_iteration",
+                "median_last_improvement_sec",
+                "tolerance",
+                "median_within_tol_iteration",
+                "median_within_tol_sec",
+            ],
+        )
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(
+                {
+                    "algorithm": row.algorithm,
+                    "runs": row.runs,
+                    "iterations": row.iterations,
+                    "median_final_gap_pct": _fmt_sig(row.median_final_gap_pct),
+                    "median_last_improvement_iteration": _fmt_sig(
+                        row.median_last_improvement_iteration
+                    ),
+                    "median_last_improvement_sec": _fmt_sig(
+                        row.median_last_improvement_sec
+                    ),
+                    "tolerance": tolerance,
+                    "median_within_tol_iteration": _fmt_sig(
+                        row.median_within_tol_iteration
+                    ),
+                    "median_within_tol_sec": _fmt_sig(row.median_within_tol_sec),
+                }
+            )
+
+
+def _plot(
+    traces: dict[str, list[RunTrace]],
+    reference: dict[str, float],
+    output_path: Path,
+    *,
+    x_axis: str,
+) -> None:
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+
+    mpl.rcParams.update(
+        {
+            "font.family": "serif",
+            "mathtext.fontset": "stix",
+            "font.size": 10,
+            "axes.labelsize": 10,
+            "axes.titlesize": 10,
+            "xtick.labelsize": 9,
+            "ytick.labelsize": 9,
+            "legend.fontsize": 9,
+        }
+    )
+
+    grid = _grid(traces, x_axis=x_axis)
+    fig, ax = plt.subplots(figsize=(7.2, 4.2), constrained_layout=True)
+    for algorithm, algorithm_traces in sorted(traces.items()):
+        gaps = 100.0 * _gap_curves(
+            algorithm_traces, reference, x_axis=x_axis, grid=grid
+        )
+        # Only draw where most runs already have an incumbent.
+        shown = np.mean(np.isfinite(gaps), axis=0) >= 0.5
+        if not shown.any():
+            continue
+        low, median, high = np.nanpercentile(gaps[:, shown], [25, 50, 75], axis=0)
+        (line,) = ax.step(
+            grid[shown],
+            median,
+            where="post",
+            linewidth=1.2,
+            label=display_scheduler_name(algorithm),
+        )
+        ax.fill_between(
+            grid[shown], low, high, step="post", color=line.get_color(), alpha=0.2
+        )
+
+    if x_axis == "time":
+        ax.set_xscale("log")
+        ax.set_xlabel("Elapsed time (s)")
+    else:
+        ax.set_xlabel("Iteration")
+    ax.set_ylabel("Gap to best final cost (%)")
+    ax.grid(True, which="both", linestyle=":", linewidth=0.7, alpha=0.8)
+    ax.set_axisbelow(True)
+    ax.legend(loc="upper right", frameon=False)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output_path)
+    plt.close(fig)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Summarize and plot cost-versus-time convergence from "
+            "eval.py --trace-convergence results."
+        )
+    )
+    parser.add_argument(
+        "--results-dir",
+        type=Path,
+        default=Path("eval_results"),
+        help="Directory containing per-scheduler trace_<name>.csv files.",
+    )
+    parser.add_argument(
+        "--algorithms",
+        type=str,
+        default=None,
+        help="Optional comma-separated algorithm names. Defaults to auto-discovery.",
+    )
+    parser.add_argument(
+        "--x-axis",
+        choices=tuple(X_AXES),
+        default="time",
+        help="Plot the gap against elapsed time or iteration.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.01,
+        help="Relative distance to a run's final cost that counts as converged.",
+    )
+    parser.add_argument(
+        "--summary-csv",
+        type=Path,
+        default=Path("eval_convergence_summary.csv"),
+        help="Where to write the convergence summary CSV.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("images/eval_convergence.svg"),
+        help="Where to write the convergence SVG plot.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.tolerance < 0:
+        raise ValueError("--tolerance must be non-negative.")
+
+    if args.algorithms:
+        algorithms = [
+            normalize_scheduler_name(name)
+            for name in parse_scheduler_list(args.algorithms)
+        ]
+    else:
+        algorithms = _discover_algorithms(args.results_dir)
+
+    traces: dict[str, list[RunTrace]] = {}
+    for algorithm in algorithms:
+        csv_path = args.results_dir / trace_output_filename(algorithm)
+        if not csv_path.is_file():
+            raise FileNotFoundError(f"Missing trace CSV for {algorithm}: {csv_path}")
+        algorithm_traces = _load_traces(csv_path)
+        if algorithm_traces:
+            traces[algorithm] = algorithm_traces
+    if not traces:
+        raise ValueError(
+            "No trace rows found; evaluate iterative schedulers with "
+            "eval.py --trace-convergence."
+        )
+
+    reference = _reference_costs(traces)
+    summaries = [
+        _summarize(algorithm, algorithm_traces, reference, tolerance=args.tolerance)
+        for algorithm, algorithm_traces in sorted(traces.items())
+    ]
+    _write_summary_csv(args.summary_csv, summaries, tolerance=args.tolerance)
+    _plot(traces, reference, args.output, x_axis=args.x_axis)
+    print(f"Wrote summary CSV: {args.summary_csv}")
+    print(f"Wrote figure: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
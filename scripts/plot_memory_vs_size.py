@@ -0,0 +1,354 @@
+"""
+Summarize and plot per-instance scheduler memory use against instance size.
+
+Reads the peak_traced_bytes (or rss_delta_bytes) column written by
+``eval.py --trace-memory`` for each dataset and algorithm. It plots memory
+against an instance size measure on log-log axes and fits a power law per
+algorithm, so the summary CSV shows how memory scales with instance size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from eval_utils import (
+    display_scheduler_name,
+    normalize_scheduler_name,
+    parse_scheduler_list,
+)
+
+SIG_FIGS = 4
+BYTES_PER_MIB = 1024.0**2
+
+MEMORY_METRICS = ("peak_traced_bytes", "rss_delta_bytes")
+SIZE_MEASURES = {
+    "T": ("T",),
+    "J": ("J",),
+    "M": ("M",),
+    "JT": ("J", "T"),
+    "JMT": ("J", "M", "T"),
+}
+
+
+@dataclass(frozen=True)
+class MemorySample:
+    dataset: str
+    algorithm: str
+    filename: str
+    size: float
+    memory_bytes: float
+
+
+@dataclass(frozen=True)
+class MemorySummary:
+    algorithm: str
+    n: int
+    median_memory_mib: float
+    max_memory_mib: float
+    loglog_slope: float
+    loglog_intercept: float
+
+
+def _fmt_sig(value: float) -> str:
+    if not np.isfinite(value):
+        return str(value)
+    return f"{value:.{SIG_FIGS}g}"
+
+
+def _discover_algorithms(raw_root: Path, dataset: str) -> list[str]:
+    dataset_dir = raw_root / dataset
+    if not dataset_dir.is_dir():
+        raise FileNotFoundError(f"Missing dataset directory: {dataset_dir}")
+
+    algorithms = sorted(
+        normalize_scheduler_name(path.stem.removeprefix("eval_"))
+        for path in dataset_dir.glob("eval_*.csv")
+        if path.is_file()
+    )
+    if not algorithms:
+        raise FileNotFoundError(f"No eval_*.csv files found in {dataset_dir}")
+    return algorithms
+
+
+def _load_samples(
+    csv_path: Path, *, dataset: str, algorithm: str, metric: str, size: str
+) -> list[MemorySample]:
+    samples: list[MemorySample] = []
+    with csv_path.open(newline="") as handle:
+        reader = csv.DictReader(handle)
+        required = {"filename", metric, *SIZE_MEASURES[size]}
+        missing = required - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{csv_path} missing required columns: {sorted(missing)}.")
+        for row in reader:
+            if not row[metric]:
+                # Run evaluated without --trace-memory.
+                continue
+            samples.append(
+                MemorySample(
+                    dataset=dataset,
+                    algorithm=algorithm,
+                    filename=row["filename"],
+                    size=float(np.prod([int(row[key]) for key in SIZE_MEASURES[size]])),
+                    memory_bytes=float(row[metric]),
+                )
+            )
+    return samples
+
+
+def _load_all_samples(
+    *,
+    raw_root: Path,
+    datasets: list[str],
+    algorithms: list[str],
+    metric: str,
+    size: str,
+) -> list[MemorySample]:
+    samples: list[MemorySample] = []
+    for dataset in datasets:
+        dataset_dir = raw_root / dataset
+        if not dataset_dir.is_dir():
+            raise FileNotFoundError(f"Missing dataset directory: {dataset_dir}")
+        for algorithm in algorithms:
+            csv_path = dataset_dir / f"eval_{algorithm}.csv"
+            if not csv_path.is_file():
+                raise FileNotFoundError(
+                    f"Missing CSV for {dataset}:{algorithm}: {csv_path}"
+                )
+            samples.extend(
+                _load_samples(
+                    csv_path,
+                    dataset=dataset,
+                    algorithm=algorithm,
+                    metric=metric,
+                    size=size,
+                )
+            )
+    if not samples:
+        raise ValueError(
+            f"No {metric} values found; evaluate with eval.py --trace-memory."
+        )
+    return samples
+
+
+def _summarize(samples: list[MemorySample]) -> list[MemorySummary]:
+    grouped: dict[str, list[MemorySample]] = {}
+    for sample in samples:
+        grouped.setdefault(sample.algorithm, []).append(sample)
+
+    summaries: list[MemorySummary] = []
+    for algorithm, algorithm_samples in grouped.items():
+        sizes = np.asarray([sample.size for sample in algorithm_samples])
+        memory = np.asarray([sample.memory_bytes for sample in algorithm_samples])
+        positive = (sizes > 0) & (memory > 0)
+        slope = intercept = float("nan")
+        if np.unique(sizes[positive]).size >= 2:
+            slope, intercept = (
+                float(value)
+                for value in np.polyfit(
+                    np.log(sizes[positive]), np.log(memory[positive]), 1
+                )
+            )
+        summaries.append(
+            MemorySummary(
+                algorithm=algorithm,
+                n=int(memory.size),
+                median_memory_mib=float(np.median(memory)) / BYTES_PER_MIB,
+                max_memory_mib=float(memory.max()) / BYTES_PER_MIB,
+                loglog_slope=slope,
+                loglog_intercept=intercept,
+            )
+        )
+    return summaries
+
+
+def _write_summary_csv(path: Path, rows: list[MemorySummary], *, size: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(
+            handle,
+            fieldnames=[
+                "algorithm",
+                "size_measure",
+                "n",
+                "median_memory_mib",
+                "max_memory_mib",
+                "loglog_slope",
+                "loglog_intercept",
+            ],
+        )
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(
+                {
+                    "algorithm": row.algorithm,
+                    "size_measure": size,
+                    "n": row.n,
+                    "median_memory_mib": _fmt_sig(row.median_memory_mib),
+                    "max_memory_mib": _fmt_sig(row.max_memory_mib),
+                    "loglog_slope": _fmt_sig(row.loglog_slope),
+                    "loglog_intercept": _fmt_sig(row.loglog_intercept),
+                }
+            )
+
+
+def _plot(
+    samples: list[MemorySample],
+    summaries: list[MemorySummary],
+    output_path: Path,
+    *,
+    metric: str,
+    size: str,
+) -> None:
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+
+    mpl.rcParams.update(
+        {
+            "font.family": "serif",
+            "mathtext.fontset": "stix",
+            "font.size": 10,
+            "axes.labelsize": 10,
+            "axes.titlesize": 10,
+            "xtick.labelsize": 9,
+            "ytick.labelsize": 9,
+            "legend.fontsize": 9,
+        }
+    )
+
+    fig, ax = plt.subplots(figsize=(7.2, 4.2), constrained_layout=True)
+    markers = ("o", "s", "D", "^", "v", "P", "X", "*")
+    for idx, summary in enumerate(
+        sorted(summaries, key=lambda row: row.median_memory_mib)
+    ):
+        algorithm_samples = [
+            sample for sample in samples if sample.algorithm == summary.algorithm
+        ]
+        sizes = np.asarray([sample.size for sample in algorithm_samples])
+        memory_mib = (
+            np.asarray([sample.memory_bytes for sample in algorithm_samples])
+            / BYTES_PER_MIB
+        )
+        scatter = ax.scatter(
+            sizes,
+            memory_mib,
+            s=10,
+            marker=markers[idx % len(markers)],
+            alpha=0.6,
+            label=display_scheduler_name(summary.algorithm),
+        )
+        if np.isfinite(summary.loglog_slope):
+            fit_sizes = np.geomspace(sizes[sizes > 0].min(), sizes.max(), 50)
+            fit_mib = (
+                np.exp(summary.loglog_intercept)
+                * fit_sizes**summary.loglog_slope
+                / BYTES_PER_MIB
+            )
+            ax.plot(fit_sizes, fit_mib, color=scatter.get_facecolor()[0], linewidth=1)
+
+    size_label = r" \cdot ".join(SIZE_MEASURES[size])
+    metric_label = {
+        "peak_traced_bytes": "Peak traced memory (MiB)",
+        "rss_delta_bytes": "Peak RSS growth (MiB)",
+    }[metric]
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel(f"Instance size ${size_label}$")
+    ax.set_ylabel(metric_label)
+    ax.grid(True, which="both", linestyle=":", linewidth=0.7, alpha=0.8)
+    ax.set_axisbelow(True)
+    ax.legend(loc="upper left", frameon=False)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output_path)
+    plt.close(fig)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Summarize scheduler memory use from eval.py --trace-memory results "
+            "and plot it against instance size."
+        )
+    )
+    parser.add_argument(
+        "--raw-root",
+        type=Path,
+        default=Path("evaluation/raw"),
+        help="Root directory containing per-dataset raw evaluation CSVs.",
+    )
+    parser.add_argument(
+        "--datasets",
+        type=str,
+        default="balanced,job_heavy,machine_heavy",
+        help="Comma-separated dataset names to include.",
+    )
+    parser.add_argument(
+        "--algorithms",
+        type=str,
+        default=None,
+        help="Optional comma-separated algorithm names. Defaults to auto-discovery.",
+    )
+    parser.add_argument(
+        "--metric",
+        choices=MEMORY_METRICS,
+        default="peak_traced_bytes",
+        help="Memory column to plot.",
+    )
+    parser.add_argument(
+        "--size",
+        choices=tuple(SIZE_MEASURES),
+        default="JT",
+        help="Instance size measure: product of the given dimensions.",
+    )
+    parser.add_argument(
+        "--summary-csv",
+        type=Path,
+        default=Path("evaluation/results/cross_dataset/eval_memory_summary.csv"),
+        help="Where to write the memory summary CSV.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("images/eval_memory_vs_size.svg"),
+        help="Where to write the memory SVG plot.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    datasets = parse_scheduler_list(args.datasets)
+    if not datasets:
+        raise ValueError("Provide at least one dataset in --datasets.")
+
+    if args.algorithms:
+        algorithms = [
+            normalize_scheduler_name(name)
+            for name in parse_scheduler_list(args.algorithms)
+        ]
+    else:
+        algorithms = _discover_algorithms(args.raw_root, datasets[0])
+
+    samples = _load_all_samples(
+        raw_root=args.raw_root,
+        datasets=datasets,
+        algorithms=algorithms,
+        metric=args.metric,
+        size=args.size,
+    )
+    summaries = _summarize(samples)
+    _write_summary_csv(args.summary_csv, summaries, size=args.size)
+    _plot(samples, summaries, args.output, metric=args.metric, size=args.size)
+    print(f"Wrote summary CSV: {args.summary_csv}")
+    print(f"Wrote figure: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import csv
-from collections.abc import Iterable, Mapping, Sequence
+import itertools
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import cast
+from typing import TypeVar, cast
 
 # from typing import tuple
 import numpy as np
 
+from compact_dtypes import compact_array
+from packed_dataset import PackedDatasetWriter
 from simulator.problem import ProblemInstance
+from sparse_job_counts import SparseJobCounts, SparseProblemInstance
 
 RESOURCE_TYPES = ("cpu", "memory", "disk", "io")
 RESOURCE_COUNT = len(RESOURCE_TYPES)
@@ -27,15 +35,24 @@ DEFAULT_BASE_DEMAND = {
     "disk": 250,
     "io": 250,
 }
+DEFAULT_BASE_SLOT_LOAD = 12
+# Parallel packed generation: instances per task, and tasks in flight per worker.
+# Generated instances wait in this process until they are written in order, so
+# both bound its memory use.
+PACKED_MAX_CHUNKSIZE = 8
+PACKED_TASKS_PER_WORKER = 2
 
 ResourceValues = Mapping[str, int] | Sequence[int] | np.ndarray
 
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
 
 @dataclass(frozen=True)
 class DatasetInstance:
     """Pair a generated instance with its sampled dimensions."""
 
-    instance: ProblemInstance
+    instance: ProblemInstance | SparseProblemInstance
     K: int
     J: int
     M: int
@@ -142,7 +159,18 @@ def _generate_capacities_and_requirements(
     job_primary: np.ndarray,
     machine_primary: np.ndarray,
     rng: np.random.Generator,
+    batched_repair: bool = False,
 ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sample capacity (K, M) and requirement (K, J) matrices and repair infeasible jobs.
+
+    Specialization multipliers are applied with fancy indexing and the job/machine fit
+    matrix is computed once. By default, jobs that fit no machine type are repaired one
+    at a time in job order, which reproduces the RNG stream of previously generated
+    datasets. With ``batched_repair=True`` all such jobs pick their repair target at
+    once and the capacity raises are applied in a single scatter; this is faster when
+    many jobs need repair but gives different matrices for the same seed.
+    """
     if base_capacities.shape != (K,) or base_demands.shape != (K,):
         raise ValueError("base_capacities and base_demands must have shape (K,).")
 
@@ -152,20 +180,38 @@ def _generate_capacities_and_requirements(
     capacities *= rng.uniform(cap_jitter_low, cap_jitter_high, size=(K, M))
     requirements *= rng.uniform(dem_jitter_low, dem_jitter_high, size=(K, J))
 
-    for m, primary in enumerate(machine_primary):
-        if primary >= 0:
-            mult = rng.integers(mult_low, mult_high + 1)
-            capacities[primary, m] *= mult
+    # Drawing all multipliers in one call consumes the same stream as drawing them
+    # one specialized entity at a time (machines first, then jobs).
+    specialized_machines = np.flatnonzero(machine_primary >= 0)
+    capacities[machine_primary[specialized_machines], specialized_machines] *= (
+        rng.integers(mult_low, mult_high + 1, size=specialized_machines.size)
+    )
 
-    for j, primary in enumerate(job_primary):
-        if primary >= 0:
-            mult = rng.integers(mult_low, mult_high + 1)
-            requirements[primary, j] *= mult
+    specialized_jobs = np.flatnonzero(job_primary >= 0)
+    requirements[job_primary[specialized_jobs], specialized_jobs] *= rng.integers(
+        mult_low, mult_high + 1, size=specialized_jobs.size
+    )
 
     capacities = np.maximum(1, np.rint(capacities)).astype(int)
     requirements = np.maximum(1, np.rint(requirements)).astype(int)
 
-    for j in range(J):
+    unfittable = np.flatnonzero(~_fit_matrix(capacities, requirements).any(axis=1))
+    if unfittable.size == 0:
+        return capacities, requirements
+
+    if batched_repair:
+        _repair_unfittable_jobs_batched(
+            capacities,
+            requirements,
+            unfittable=unfittable,
+            job_primary=job_primary,
+            machine_primary=machine_primary,
+            rng=rng,
+        )
+        return capacities, requirements
+
+    # Capacities only grow during repair, so jobs that fit initially keep fitting.
+    for j in unfittable:
         fits = np.all(capacities >= requirements[:, j][:, None], axis=0)
         if fits.any():
             continue
@@ -183,6 +229,51 @@ def _generate_capacities_and_requirements(
     return capacities, requirements
 
 
+def _fit_matrix(capacities: np.ndarray, requirements: np.ndarray) -> np.ndarray:
+    """Return the (J, M) matrix telling whether job type j fits machine type m."""
+    K, M = capacities.shape
+    J = requirements.shape[1]
+    fits = np.ones((J, M), dtype=bool)
+    for k in range(K):
+        fits &= capacities[k][None, :] >= requirements[k][:, None]
+    return fits
+
+
+def _repair_unfittable_jobs_batched(
+    capacities: np.ndarray,
+    requirements: np.ndarray,
+    *,
+    unfittable: np.ndarray,
+    job_primary: np.ndarray,
+    machine_primary: np.ndarray,
+    rng: np.random.Generator,
+) -> None:
+    """Raise capacities in place so that every job in ``unfittable`` fits a machine."""
+    K = capacities.shape[0]
+    targets = np.full(
+        unfittable.size, int(np.argmax(np.sum(capacities, axis=0))), dtype=int
+    )
+
+    specialized = machine_primary >= 0
+    candidates_per_resource = np.bincount(machine_primary[specialized], minlength=K)
+    candidate_order = np.argsort(machine_primary, kind="stable")
+    candidate_start = np.searchsorted(
+        machine_primary[candidate_order], np.arange(K), side="left"
+    )
+
+    primary = job_primary[unfittable]
+    has_candidates = primary >= 0
+    has_candidates[has_candidates] = (
+        candidates_per_resource[primary[has_candidates]] > 0
+    )
+    if has_candidates.any():
+        chosen = primary[has_candidates]
+        offsets = rng.integers(0, candidates_per_resource[chosen])
+        targets[has_candidates] = candidate_order[candidate_start[chosen] + offsets]
+
+    np.maximum.at(capacities.T, targets, requirements[:, unfittable].T)
+
+
 def _generate_job_counts(
     *,
     K: int,
@@ -197,8 +288,23 @@ def _generate_job_counts(
     job_primary: np.ndarray,
     slot_primary_correlation: float,
     rng: np.random.Generator,
-) -> np.ndarray:
-    """Sample job-count matrix L with slot primary resources that bias toward matching jobs."""
+    batched: bool = False,
+    sparse: bool = False,
+) -> np.ndarray | SparseJobCounts:
+    """
+    Sample job-count matrix L with slot primary resources that bias toward matching jobs.
+
+    By default each time slot draws its load, weights, focus multiplier and multinomial
+    sample in turn, which reproduces the RNG stream of previously generated datasets.
+    With ``batched=True`` all slots are sampled at once as (T, J) arrays and L is drawn
+    in a single multinomial call. Both modes sample from the same distribution, but they
+    consume the RNG stream in a different order and therefore give different matrices
+    for the same seed.
+
+    With ``sparse=True`` L is returned as ``SparseJobCounts``. The per-slot path then
+    only keeps the non-zero counts of each slot; the batched path converts its (T, J)
+    sample. The sampled values are identical to the dense result.
+    """
     job_hist = (
         np.bincount(job_primary[job_primary >= 0], minlength=K)
         if np.any(job_primary >= 0)
@@ -224,7 +330,25 @@ def _generate_job_counts(
         prob=slot_pref,
     )
 
-    job_counts = np.zeros((T, J), dtype=int)
+    if batched:
+        job_counts = _sample_job_counts_batched(
+            J=J,
+            T=T,
+            base_slot_load=base_slot_load,
+            load_jitter_low=load_jitter_low,
+            load_jitter_high=load_jitter_high,
+            focus_low=focus_low,
+            focus_high=focus_high,
+            job_primary=job_primary,
+            slot_primary=slot_primary,
+            rng=rng,
+        )
+        return SparseJobCounts.from_dense(job_counts) if sparse else job_counts
+
+    job_counts = np.zeros((0 if sparse else T, J), dtype=int)
+    slot_nnz = np.zeros(T + 1, dtype=np.int64)
+    slot_indices: list[np.ndarray] = []
+    slot_data: list[np.ndarray] = []
     for t in range(T):
         slot_total = max(
             1,
@@ -241,11 +365,57 @@ def _generate_job_counts(
 
         weights_sum = float(weights.sum())
         probs = weights / weights_sum
-        job_counts[t, :] = rng.multinomial(slot_total, probs)
-
+        counts = rng.multinomial(slot_total, probs)
+        if sparse:
+            nonzero = np.flatnonzero(counts)
+            slot_nnz[t + 1] = nonzero.size
+            slot_indices.append(nonzero)
+            slot_data.append(counts[nonzero])
+        else:
+            job_counts[t, :] = counts
+
+    if sparse:
+        return SparseJobCounts(
+            indptr=np.cumsum(slot_nnz),
+            indices=np.concatenate(slot_indices).astype(np.int64),
+            data=np.concatenate(slot_data).astype(np.int64),
+            num_jobs=J,
+        )
     return job_counts
 
 
+def _sample_job_counts_batched(
+    *,
+    J: int,
+    T: int,
+    base_slot_load: int,
+    load_jitter_low: float,
+    load_jitter_high: float,
+    focus_low: int,
+    focus_high: int,
+    job_primary: np.ndarray,
+    slot_primary: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Draw all T rows of L at once; see ``_generate_job_counts``."""
+    slot_totals = np.maximum(
+        1,
+        np.rint(
+            base_slot_load * rng.uniform(load_jitter_low, load_jitter_high, size=T)
+        ),
+    ).astype(int)
+    weights = rng.uniform(0.5, 1.0, size=(T, J))
+    focus_mult = rng.integers(focus_low, focus_high + 1, size=T)
+
+    matching = (slot_primary[:, None] >= 0) & (
+        slot_primary[:, None] == job_primary[None, :]
+    )
+    weights *= np.where(matching, focus_mult[:, None], 1)
+
+    probs = weights / weights.sum(axis=1, keepdims=True)
+    return rng.multinomial(slot_totals, probs).astype(int)
+
+
 def _compute_costs(
     capacities: np.ndarray,
     resource_weights: np.ndarray | None,
@@ -276,7 +446,7 @@ def generate_random_instance(
     specialized_job_ratio: float = 0.7,
     specialized_machine_ratio: float = 0.7,
     correlation: float = 0.7,
-    base_slot_load: int = 12,
+    base_slot_load: int = DEFAULT_BASE_SLOT_LOAD,
     slot_load_jitter: tuple[float, float] = (0.6, 1.4),
     slot_focus_ratio: float = 0.6,
     slot_specialization_correlation: float = 0.7,
@@ -285,7 +455,10 @@ def generate_random_instance(
     gamma: float | None = 0.10,
     rng: np.random.Generator | None = None,
     seed: int | None = None,
-) -> ProblemInstance:
+    batched_job_counts: bool = False,
+    batched_repair: bool = False,
+    sparse_job_counts: bool = False,
+) -> ProblemInstance | SparseProblemInstance:
     """
     Generate heterogeneous capacity (C) and demand (R) matrices with correlated specializations.
 
@@ -325,6 +498,15 @@ def generate_random_instance(
     resource_weights: optional resource cost weight vector (K,). Randomly sampled if None.
     gamma: running-cost factor applied to purchase costs.
     rng/seed: random generator or seed used for reproducibility.
+    batched_job_counts: sample the whole job-count matrix in one batched multinomial call
+        instead of one call per time slot. Much faster for large T, but the per-slot
+        default is required to reproduce datasets generated with an earlier seed.
+    batched_repair: repair all job types that fit no machine type in one batched step
+        instead of one job at a time. Faster for large J and M, but like
+        ``batched_job_counts`` it changes the generated instance for a given seed.
+    sparse_job_counts: return a ``SparseProblemInstance`` whose job-count matrix is
+        stored per time slot in CSR form. The sampled instance is the same as with the
+        dense default; call ``to_problem`` to obtain a dense ``ProblemInstance``.
     """
 
     if K != RESOURCE_COUNT:
@@ -420,6 +602,7 @@ def generate_random_instance(
         job_primary=job_primary,
         machine_primary=machine_primary,
         rng=rng,
+        batched_repair=batched_repair,
     )
 
     job_counts = _generate_job_counts(
@@ -435,6 +618,8 @@ def generate_random_instance(
         job_primary=job_primary,
         slot_primary_correlation=slot_specialization_correlation,
         rng=rng,
+        batched=batched_job_counts,
+        sparse=sparse_job_counts,
     )
 
     purchase_costs, running_costs, resource_weights_used = _compute_costs(
@@ -444,7 +629,8 @@ def generate_random_instance(
         rng=rng,
     )
 
-    return ProblemInstance(
+    instance_cls = SparseProblemInstance if sparse_job_counts else ProblemInstance
+    return instance_cls(
         capacities=capacities,
         requirements=requirements,
         job_counts=job_counts,
@@ -454,6 +640,57 @@ def generate_random_instance(
     )
 
 
+def _validate_dataset_request(num_instances: int, K_range: tuple[int, int]) -> None:
+    if num_instances <= 0:
+        raise ValueError("num_instances must be a positive integer.")
+
+    if K_range != (RESOURCE_COUNT, RESOURCE_COUNT):
+        raise ValueError(
+            f"K_range must be fixed to ({RESOURCE_COUNT}, {RESOURCE_COUNT})."
+        )
+
+
+def _generate_dataset_instance(
+    *,
+    J_range: tuple[int, int],
+    M_range: tuple[int, int],
+    T_range: tuple[int, int],
+    base_capacity: ResourceValues | None = None,
+    base_demand: ResourceValues | None = None,
+    rng: np.random.Generator,
+    batched_job_counts: bool = False,
+    batched_repair: bool = False,
+    sparse_job_counts: bool = False,
+    base_slot_load: int = DEFAULT_BASE_SLOT_LOAD,
+) -> DatasetInstance:
+    K = RESOURCE_COUNT
+    J = _sample_dimension(rng, J_range, "J_range")
+    M = _sample_dimension(rng, M_range, "M_range")
+    T = _sample_dimension(rng, T_range, "T_range")
+
+    instance = generate_random_instance(
+        K=K,
+        J=J,
+        M=M,
+        T=T,
+        base_capacity=base_capacity,
+        base_demand=base_demand,
+        rng=rng,
+        batched_job_counts=batched_job_counts,
+        batched_repair=batched_repair,
+        sparse_job_counts=sparse_job_counts,
+        base_slot_load=base_slot_load,
+    )
+
+    return DatasetInstance(
+        instance=instance,
+        K=K,
+        J=J,
+        M=M,
+        T=T,
+    )
+
+
 def generate_dataset_instances(
     num_instances: int,
     *,
@@ -464,104 +701,177 @@ def generate_dataset_instances(
     base_capacity: ResourceValues | None = None,
     base_demand: ResourceValues | None = None,
     rng: np.random.Generator,
-) -> list[DatasetInstance]:
+    batched_job_counts: bool = False,
+    batched_repair: bool = False,
+    sparse_job_counts: bool = False,
+    base_slot_load: int = DEFAULT_BASE_SLOT_LOAD,
+) -> Iterator[DatasetInstance]:
     """
-    Generate a dataset of random problem instances without persisting them.
+    Lazily generate a dataset of random problem instances without persisting them.
 
     Each instance samples J, M, and T uniformly within the provided ranges. K is fixed
-    and must be equal to ``RESOURCE_COUNT``.
+    and must be equal to ``RESOURCE_COUNT``. ``batched_job_counts``,
+    ``batched_repair``, ``sparse_job_counts`` and ``base_slot_load`` are forwarded to
+    ``generate_random_instance``.
+
+    Arguments are validated eagerly, but instances are only generated as the returned
+    iterator is consumed, so at most one instance needs to be held in memory.
     """
 
-    if num_instances <= 0:
-        raise ValueError("num_instances must be a positive integer.")
+    _validate_dataset_request(num_instances, K_range)
 
-    if K_range != (RESOURCE_COUNT, RESOURCE_COUNT):
-        raise ValueError(
-            f"K_range must be fixed to ({RESOURCE_COUNT}, {RESOURCE_COUNT})."
+    return (
+        _generate_dataset_instance(
+            J_range=J_range,
+            M_range=M_range,
+            T_range=T_range,
+            base_capacity=base_capacity,
+            base_demand=base_demand,
+            rng=rng,
+            batched_job_counts=batched_job_counts,
+            batched_repair=batched_repair,
+            sparse_job_counts=sparse_job_counts,
+            base_slot_load=base_slot_load,
         )
+        for _ in range(num_instances)
+    )
 
-    instances: list[DatasetInstance] = []
 
-    K = RESOURCE_COUNT
+def _instance_filename(idx: int) -> str:
+    return f"instance_{idx:04d}.npz"
 
-    for _ in range(num_instances):
-        J = _sample_dimension(rng, J_range, "J_range")
-        M = _sample_dimension(rng, M_range, "M_range")
-        T = _sample_dimension(rng, T_range, "T_range")
 
-        instance = generate_random_instance(
-            K=K,
-            J=J,
-            M=M,
-            T=T,
-            base_capacity=base_capacity,
-            base_demand=base_demand,
-            rng=rng,
-        )
+def _instance_arrays(
+    instance: ProblemInstance | SparseProblemInstance,
+) -> dict[str, np.ndarray]:
+    if isinstance(instance.job_counts, SparseJobCounts):
+        job_counts = instance.job_counts.to_arrays()
+    else:
+        job_counts = {"job_counts": instance.job_counts}
+    return {
+        "capacities": instance.capacities,
+        "requirements": instance.requirements,
+        **job_counts,
+        "purchase_costs": instance.purchase_costs,
+        "running_costs": instance.running_costs,
+        "resource_weights": instance.resource_weights,
+    }
 
-        instances.append(
-            DatasetInstance(
-                instance=instance,
-                K=K,
-                J=J,
-                M=M,
-                T=T,
-            )
-        )
 
-    return instances
+def _write_instance(
+    entry: DatasetInstance,
+    *,
+    dataset_path: Path,
+    idx: int,
+    packed_writer: PackedDatasetWriter | None = None,
+    compact_dtypes: bool = False,
+    compress: bool = False,
+) -> dict[str, int | str]:
+    filename = _instance_filename(idx)
+    dims = {"K": entry.K, "J": entry.J, "M": entry.M, "T": entry.T}
+    arrays = _instance_arrays(entry.instance)
+
+    if packed_writer is not None:
+        packed_writer.append(filename, dims, arrays)
+    else:
+        if compact_dtypes:
+            arrays = {key: compact_array(value) for key, value in arrays.items()}
+        save = np.savez_compressed if compress else np.savez
+        save(dataset_path / filename, **arrays, **dims)
+
+    return {"filename": filename, **dims}
+
+
+def _write_dataset_csv(
+    dataset_path: Path,
+    metadata: Iterable[dict[str, int | str]],
+    *,
+    append: bool = False,
+) -> list[dict[str, int | str]]:
+    """Write (or extend) ``dataset.csv`` row by row as ``metadata`` is consumed."""
+    rows: list[dict[str, int | str]] = []
+    csv_path = dataset_path / "dataset.csv"
+    with csv_path.open("a" if append else "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=["filename", "K", "J", "M", "T"])
+        if not append:
+            writer.writeheader()
+        for row in metadata:
+            writer.writerow(row)
+            csv_file.flush()
+            rows.append(row)
+    return rows
 
 
 def write_dataset(
     instances: Iterable[DatasetInstance],
     *,
     dataset_dir: str | Path = "dataset",
+    packed: bool = False,
+    compact_dtypes: bool = False,
+    compress: bool = False,
+    start: int = 0,
 ) -> list[dict[str, int | str]]:
-    """Write a dataset of generated instances to disk."""
+    """
+    Write a dataset of generated instances to disk.
+
+    ``instances`` is consumed one entry at a time: each instance is written and its
+    ``dataset.csv`` row appended before the next one is requested, so passing the
+    iterator from ``generate_dataset_instances`` keeps a single instance in memory.
+
+    With ``packed=True`` the instances are written to the packed layout described in
+    ``packed_dataset`` instead of one ``.npz`` file per instance.
+
+    ``compact_dtypes`` stores every array with the smallest lossless integer/float
+    dtype (see ``compact_dtypes``); loaders widen them back. ``compress`` writes the
+    ``.npz`` files with ``np.savez_compressed``, trading load speed for disk space.
+    The packed layout is always uncompressed so that it can be memory-mapped.
+
+    ``start`` is the index of the first instance. A positive ``start`` extends an
+    existing dataset of ``start`` instances in place instead of replacing it.
+    """
+
+    if packed and compress:
+        raise ValueError("compress only applies to the npz layout.")
+    if start < 0:
+        raise ValueError("start must be non-negative.")
+    append = start > 0
 
     dataset_path = Path(dataset_dir)
     dataset_path.mkdir(parents=True, exist_ok=True)
 
-    metadata: list[dict[str, int | str]] = []
-
-    for idx, entry in enumerate(instances):
-        filename = f"instance_{idx:04d}.npz"
-        file_path = dataset_path / filename
-
-        instance = entry.instance
-
-        np.savez(
-            file_path,
-            capacities=instance.capacities,
-            requirements=instance.requirements,
-            job_counts=instance.job_counts,
-            purchase_costs=instance.purchase_costs,
-            running_costs=instance.running_costs,
-            resource_weights=instance.resource_weights,
-            K=entry.K,
-            J=entry.J,
-            M=entry.M,
-            T=entry.T,
+    if not packed:
+        return _write_dataset_csv(
+            dataset_path,
+            (
+                _write_instance(
+                    entry,
+                    dataset_path=dataset_path,
+                    idx=idx,
+                    compact_dtypes=compact_dtypes,
+                    compress=compress,
+                )
+                for idx, entry in enumerate(instances, start=start)
+            ),
+            append=append,
         )
 
-        metadata.append(
-            {
-                "filename": filename,
-                "K": entry.K,
-                "J": entry.J,
-                "M": entry.M,
-                "T": entry.T,
-            }
+    with PackedDatasetWriter(
+        dataset_path, compact=compact_dtypes, append=append
+    ) as packed_writer:
+        return _write_dataset_csv(
+            dataset_path,
+            (
+                _write_instance(
+                    entry,
+                    dataset_path=dataset_path,
+                    idx=idx,
+                    packed_writer=packed_writer,
+                )
+                for idx, entry in enumerate(instances, start=start)
+            ),
+            append=append,
         )
 
-    csv_path = dataset_path / "dataset.csv"
-    with csv_path.open("w", newline="") as csv_file:
-        writer = csv.DictWriter(csv_file, fieldnames=["filename", "K", "J", "M", "T"])
-        writer.writeheader()
-        writer.writerows(metadata)
-
-    return metadata
-
 
 def write_dataset_parameters_csv(
     parameters: object,
@@ -588,16 +898,19 @@ def write_dataset_parameters_csv(
         "M_max",
         "T_min",
         "T_max",
+        "base_slot_load",
         "output_dir",
         "dataset_dir",
     ),
+    replace_last: bool = False,
 ) -> None:
     """
     Write dataset-generation parameters in a wide (1 row per dataset) CSV format.
 
     If the file already exists, a new row is appended. If the set/order of columns
     changes between runs, the file is rewritten with the union of columns so that
-    each dataset run remains a single row.
+    each dataset run remains a single row. With ``replace_last`` the new row replaces
+    the last existing row instead, e.g. after a dataset was extended in place.
     """
 
     dataset_path = Path(dataset_dir)
@@ -648,7 +961,9 @@ def write_dataset_parameters_csv(
         existing_fields = list(pivoted.keys())
         existing_rows = [pivoted] if pivoted else []
 
-    if existing_fields == ordered_fields:
+    if replace_last and existing_rows:
+        existing_rows = existing_rows[:-1]
+    elif existing_fields == ordered_fields:
         with csv_path.open("a", newline="") as csv_file:
             writer = csv.DictWriter(csv_file, fieldnames=ordered_fields)
             writer.writerow(row)
@@ -687,11 +1002,20 @@ def generate_dataset(
     base_demand: ResourceValues | None = None,
     dataset_dir: str | Path = "dataset",
     rng: np.random.Generator,
+    batched_job_counts: bool = False,
+    batched_repair: bool = False,
+    sparse_job_counts: bool = False,
+    base_slot_load: int = DEFAULT_BASE_SLOT_LOAD,
+    packed: bool = False,
+    compact_dtypes: bool = False,
+    compress: bool = False,
 ) -> list[dict[str, int | str]]:
     """
     Generate a dataset of random problem instances and store them on disk.
 
     Returns a list of metadata rows that also get written to ``dataset/dataset.csv``.
+    ``packed``, ``compact_dtypes`` and ``compress`` select the storage format (see
+    ``write_dataset``).
     """
 
     instances = generate_dataset_instances(
@@ -703,5 +1027,209 @@ def generate_dataset(
         base_capacity=base_capacity,
         base_demand=base_demand,
         rng=rng,
+        batched_job_counts=batched_job_counts,
+        batched_repair=batched_repair,
+        sparse_job_counts=sparse_job_counts,
+        base_slot_load=base_slot_load,
+    )
+    return write_dataset(
+        instances,
+        dataset_dir=dataset_dir,
+        packed=packed,
+        compact_dtypes=compact_dtypes,
+        compress=compress,
     )
-    return write_dataset(instances, dataset_dir=dataset_dir)
+
+
+def spawn_instance_seeds(
+    seed: int, num_instances: int, *, start: int = 0
+) -> list[np.random.SeedSequence]:
+    """
+    Derive one independent seed sequence per instance index from a dataset seed.
+
+    Instance ``idx`` always gets the ``idx``-th child of ``SeedSequence(seed)``, so the
+    seed of an instance does not depend on how many instances are generated or on the
+    order in which they are produced.
+    """
+
+    root = np.random.SeedSequence(seed, n_children_spawned=start)
+    return root.spawn(num_instances)
+
+
+def _generate_seeded_instance(
+    seed_sequence: np.random.SeedSequence,
+    *,
+    generation_kwargs: Mapping[str, object],
+) -> DatasetInstance:
+    return _generate_dataset_instance(
+        rng=np.random.default_rng(seed_sequence), **generation_kwargs
+    )
+
+
+def _generate_and_write_seeded_instance(
+    task: tuple[int, np.random.SeedSequence],
+    *,
+    dataset_path: Path,
+    generation_kwargs: Mapping[str, object],
+    compact_dtypes: bool,
+    compress: bool,
+) -> dict[str, int | str]:
+    idx, seed_sequence = task
+    entry = _generate_seeded_instance(
+        seed_sequence, generation_kwargs=generation_kwargs
+    )
+    return _write_instance(
+        entry,
+        dataset_path=dataset_path,
+        idx=idx,
+        compact_dtypes=compact_dtypes,
+        compress=compress,
+    )
+
+
+def _map_chunk(fn: Callable[[ItemT], ResultT], chunk: list[ItemT]) -> list[ResultT]:
+    return [fn(item) for item in chunk]
+
+
+def _bounded_map(
+    executor: Executor,
+    fn: Callable[[ItemT], ResultT],
+    items: Iterable[ItemT],
+    *,
+    chunksize: int,
+    max_pending: int,
+) -> Iterator[ResultT]:
+    """
+    ``fn`` over ``items`` in order, like ``executor.map`` with ``chunksize``, but
+    with at most ``max_pending`` chunks submitted ahead of the consumer.
+    """
+
+    iterator = iter(items)
+    pending: deque[Future[list[ResultT]]] = deque()
+
+    def submit() -> None:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if chunk:
+            pending.append(executor.submit(_map_chunk, fn, chunk))
+
+    for _ in range(max_pending):
+        submit()
+    while pending:
+        results = pending.popleft().result()
+        submit()
+        yield from results
+
+
+def generate_dataset_parallel(
+    num_instances: int,
+    *,
+    K_range: tuple[int, int],
+    J_range: tuple[int, int],
+    M_range: tuple[int, int],
+    T_range: tuple[int, int],
+    base_capacity: ResourceValues | None = None,
+    base_demand: ResourceValues | None = None,
+    dataset_dir: str | Path = "dataset",
+    seed: int,
+    workers: int | None = None,
+    batched_job_counts: bool = False,
+    batched_repair: bool = False,
+    sparse_job_counts: bool = False,
+    base_slot_load: int = DEFAULT_BASE_SLOT_LOAD,
+    packed: bool = False,
+    compact_dtypes: bool = False,
+    compress: bool = False,
+    start: int = 0,
+) -> list[dict[str, int | str]]:
+    """
+    Generate and store a dataset with one independently seeded RNG per instance.
+
+    Instance seeds come from ``spawn_instance_seeds``, and each instance is generated
+    and written by a worker process. The dataset is therefore identical for any value
+    of ``workers`` (``None`` uses all CPU cores, ``1`` runs in-process). It differs
+    from ``generate_dataset`` with the same seed, where all instances share one stream.
+
+    With ``packed=True`` workers only generate instances; they are appended to the
+    packed files in index order by this process. Only a few chunks of instances per
+    worker are generated ahead of the writer, so memory use does not grow with
+    ``num_instances``. The storage options behave as in ``write_dataset``.
+
+    With ``start > 0`` an existing dataset of ``start`` instances is extended with
+    instances ``start..num_instances - 1``. Because instance seeds only depend on
+    their index, the result is identical to generating all ``num_instances`` at once.
+    """
+
+    _validate_dataset_request(num_instances, K_range)
+    if workers is not None and workers <= 0:
+        raise ValueError("workers must be a positive integer.")
+    if packed and compress:
+        raise ValueError("compress only applies to the npz layout.")
+    if not 0 <= start <= num_instances:
+        raise ValueError("start must be in [0, num_instances].")
+
+    dataset_path = Path(dataset_dir)
+    dataset_path.mkdir(parents=True, exist_ok=True)
+
+    generation_kwargs = {
+        "J_range": J_range,
+        "M_range": M_range,
+        "T_range": T_range,
+        "base_capacity": base_capacity,
+        "base_demand": base_demand,
+        "batched_job_counts": batched_job_counts,
+        "batched_repair": batched_repair,
+        "sparse_job_counts": sparse_job_counts,
+        "base_slot_load": base_slot_load,
+    }
+    seeds = spawn_instance_seeds(seed, num_instances - start, start=start)
+
+    if packed:
+        generate_fn = partial(
+            _generate_seeded_instance, generation_kwargs=generation_kwargs
+        )
+        if workers == 1:
+            return write_dataset(
+                map(generate_fn, seeds),
+                dataset_dir=dataset_path,
+                packed=True,
+                compact_dtypes=compact_dtypes,
+                start=start,
+            )
+        max_workers = workers or os.cpu_count() or 1
+        chunksize = max(1, min(len(seeds) // (4 * max_workers), PACKED_MAX_CHUNKSIZE))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return write_dataset(
+                _bounded_map(
+                    executor,
+                    generate_fn,
+                    seeds,
+                    chunksize=chunksize,
+                    max_pending=PACKED_TASKS_PER_WORKER * max_workers,
+                ),
+                dataset_dir=dataset_path,
+                packed=True,
+                compact_dtypes=compact_dtypes,
+                start=start,
+            )
+
+    worker_fn = partial(
+        _generate_and_write_seeded_instance,
+        dataset_path=dataset_path,
+        generation_kwargs=generation_kwargs,
+        compact_dtypes=compact_dtypes,
+        compress=compress,
+    )
+    tasks = list(enumerate(seeds, start=start))
+    append = start > 0
+
+    if workers == 1:
+        return _write_dataset_csv(dataset_path, map(worker_fn, tasks), append=append)
+
+    max_workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (4 * max_workers))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return _write_dataset_csv(
+            dataset_path,
+            executor.map(worker_fn, tasks, chunksize=chunksize),
+            append=append,
+        )
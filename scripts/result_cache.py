@@ -0,0 +1,139 @@
+"""
+On-disk cache of schedule results.
+
+A result is keyed by a SHA-256 hash of the problem arrays and of the scheduler
+configuration: its name, iteration count, time budget, slot workers, timing
+settings (warmup and repetitions), the state of its RNG when the run starts
+(which is determined by the evaluation seed), and the source code of the
+simulator package and of the local packing engine. Each entry
+is a JSON file ``<cache_dir>/<key[:2]>/<key>.json`` holding the total cost,
+machine vector, measured run times and the RNG state after the run, so that a hit
+leaves the RNG where running the scheduler would.
+
+Runs without a seed start from fresh entropy and therefore never hit, so
+``eval.py`` does not use the cache for them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+
+from dataset_cache import file_sha256, generator_code_version
+from simulator.problem import ProblemInstance
+
+SIMULATOR_PACKAGE = "simulator"
+# Local schedulers (see eval_utils.build_scheduler).
+ENGINE_SOURCES = ("packing_engine.py",)
+PROBLEM_ARRAYS = (
+    "capacities",
+    "requirements",
+    "job_counts",
+    "purchase_costs",
+    "running_costs",
+    "resource_weights",
+)
+
+
+def problem_sha256(problem: ProblemInstance) -> str:
+    """Hash the arrays of ``problem``, including their dtypes and shapes."""
+    digest = hashlib.sha256()
+    for name in PROBLEM_ARRAYS:
+        array = np.ascontiguousarray(getattr(problem, name))
+        digest.update(f"{name}:{array.dtype.str}:{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+@cache
+def scheduler_code_version() -> str:
+    """Hash the scheduler source files so that code changes invalidate the cache."""
+    import simulator
+
+    package_dir = Path(simulator.__file__).resolve().parent
+    digest = hashlib.sha256()
+    for path in sorted(package_dir.rglob("*.py")):
+        digest.update(path.relative_to(package_dir).as_posix().encode())
+        digest.update(file_sha256(path).encode())
+    digest.update(generator_code_version(ENGINE_SOURCES).encode())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedSchedule:
+    total_cost: float
+    machine_vector: list[int]
+    wall_ns: list[int]
+    cpu_ns: list[int]
+    confidence: float
+    # Whether the schedule was validated when it was stored.
+    validated: bool
+    # State of the scheduler RNG after the run.
+    rng_state: dict
+    phases: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ResultCache:
+    cache_dir: Path
+    code_version: str = field(default_factory=scheduler_code_version)
+
+    def key(
+        self,
+        problem: ProblemInstance,
+        *,
+        scheduler_name: str,
+        iterations: int,
+        time_budget: float | None,
+        rng_state: dict,
+        timing: dict[str, float],
+        slot_workers: int = 1,
+    ) -> str:
+        canonical = json.dumps(
+            {
+                "problem": problem_sha256(problem),
+                "scheduler": scheduler_name,
+                "iterations": iterations,
+                "time_budget": time_budget,
+                "rng_state": rng_state,
+                "timing": timing,
+                # Changes the measured run times, not the schedule.
+                "slot_workers": slot_workers,
+                "code_version": self.code_version,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def load(self, key: str) -> CachedSchedule | None:
+        """Return the entry for ``key``, or None when it is missing or unreadable."""
+        entry_path = self._entry_path(key)
+        if not entry_path.is_file():
+            return None
+        try:
+            data = json.loads(entry_path.read_text())
+        except ValueError:
+            return None
+        try:
+            return CachedSchedule(**data)
+        except TypeError:
+            # Written with different fields.
+            return None
+
+    def store(self, key: str, schedule: CachedSchedule) -> None:
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        staging_path = entry_path.with_name(f".{entry_path.name}.{os.getpid()}.tmp")
+        staging_path.write_text(json.dumps(asdict(schedule), sort_keys=True) + "\n")
+        os.replace(staging_path, entry_path)
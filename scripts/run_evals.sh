@@ -6,6 +6,16 @@ SCHEDULERS="${SCHEDULERS:-ffd_l2,ffd,ffd_sum,ffd_max,ffd_prod,ffd_new,bfd}"
 SEED="${SEED:-5000}"
 EVAL_ROOT="${EVAL_ROOT:-evaluation}"
 IMAGE_DIR="${IMAGE_DIR:-images}"
+DATASET_CACHE_DIR="${DATASET_CACHE_DIR:-${EVAL_ROOT}/cache/datasets}"
+# Set RESULT_CACHE_DIR to reuse schedules from earlier runs. Cached rows carry old
+# runtimes, which the runtime t-tests and plots below reject, so it is off by
+# default.
+RESULT_CACHE_DIR="${RESULT_CACHE_DIR:-}"
+# Set EVAL_WORKERS to evaluate in a process pool (0 = all cores); unset keeps the
+# serial, per-scheduler RNG stream.
+EVAL_WORKERS="${EVAL_WORKERS:-}"
+# Set EVAL_REPLICATES to run every scheduler that many times per instance.
+EVAL_REPLICATES="${EVAL_REPLICATES:-}"
 
 evaluate_dataset() {
   local name="$1"
@@ -27,6 +37,7 @@ evaluate_dataset() {
   echo "=== Dataset: ${name} (K=${k_min}-${k_max}, J=${j_min}-${j_max}, M=${m_min}-${m_max}, T=${t_min}-${t_max}) ==="
   uv run python scripts/generate_dataset.py \
     --output-dir "${dataset_dir}" \
+    --cache-dir "${DATASET_CACHE_DIR}" \
     --seed "${SEED}" \
     --K-min "${k_min}" --K-max "${k_max}" \
     --J-min "${j_min}" --J-max "${j_max}" \
@@ -38,7 +49,10 @@ evaluate_dataset() {
     --dataset "${dataset_dir}" \
     --schedulers "${SCHEDULERS}" \
     --output-dir "${raw_dir}" \
-    --seed "${SEED}"
+    --seed "${SEED}" \
+    ${RESULT_CACHE_DIR:+--result-cache "${RESULT_CACHE_DIR}"} \
+    ${EVAL_WORKERS:+--workers "${EVAL_WORKERS}"} \
+    ${EVAL_REPLICATES:+--replicates "${EVAL_REPLICATES}"}
 
   echo "Running per-scheduler summary..."
   uv run python scripts/eval_multi_summary.py \
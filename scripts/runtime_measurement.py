@@ -0,0 +1,144 @@
+"""
+Repeated wall-clock and CPU-time measurement of scheduler runs.
+
+A single timing of a run that takes a few milliseconds is dominated by noise
+(caches, frequency scaling, other processes). ``measure`` optionally runs the
+function a number of untimed warmup times and then times it repeatedly with
+``perf_counter_ns`` and ``process_time_ns``, adding repetitions until the
+confidence interval of the mean wall time is narrow enough relative to the mean.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from math import nan, sqrt
+from typing import TypeVar
+
+import numpy as np
+from scipy import stats
+
+ResultT = TypeVar("ResultT")
+
+NS_PER_SEC = 1e9
+
+
+@dataclass(frozen=True)
+class TimingConfig:
+    """
+    How to time a run.
+
+    ``warmup`` untimed runs are followed by at least ``min_repeats`` and at most
+    ``max_repeats`` timed runs. Between the two, repetitions stop once the
+    ``confidence`` interval of the mean wall time is at most ``target_ci_width``
+    times the mean. The default is a single timed run.
+    """
+
+    warmup: int = 0
+    min_repeats: int = 1
+    max_repeats: int = 1
+    target_ci_width: float = 0.05
+    confidence: float = 0.95
+
+    def __post_init__(self) -> None:
+        if self.warmup < 0:
+            raise ValueError("warmup must be non-negative.")
+        if self.min_repeats < 1:
+            raise ValueError("min_repeats must be positive.")
+        if self.max_repeats < self.min_repeats:
+            raise ValueError("max_repeats must be at least min_repeats.")
+        if self.target_ci_width <= 0:
+            raise ValueError("target_ci_width must be positive.")
+        if not 0.0 < self.confidence < 1.0:
+            raise ValueError("confidence must be in (0, 1).")
+
+
+def mean_confidence_interval(
+    values: np.ndarray, confidence: float
+) -> tuple[float, float]:
+    """Student-t confidence interval of the mean; NaNs for fewer than two values."""
+    if values.size < 2:
+        return nan, nan
+    mean = float(values.mean())
+    se = float(values.std(ddof=1)) / sqrt(values.size)
+    t_crit = float(stats.t.ppf(0.5 + confidence / 2, values.size - 1))
+    return mean - t_crit * se, mean + t_crit * se
+
+
+@dataclass(frozen=True)
+class RuntimeMeasurement:
+    """Wall and process CPU times (in nanoseconds) of the timed repetitions."""
+
+    wall_ns: tuple[int, ...]
+    cpu_ns: tuple[int, ...]
+    confidence: float = 0.95
+
+    @property
+    def repeats(self) -> int:
+        return len(self.wall_ns)
+
+    @property
+    def min_sec(self) -> float:
+        return min(self.wall_ns) / NS_PER_SEC
+
+    @property
+    def median_sec(self) -> float:
+        return float(np.median(self.wall_ns)) / NS_PER_SEC
+
+    @property
+    def cpu_median_sec(self) -> float:
+        return float(np.median(self.cpu_ns)) / NS_PER_SEC
+
+    def ci_sec(self) -> tuple[float, float]:
+        wall_sec = np.asarray(self.wall_ns, dtype=float) / NS_PER_SEC
+        return mean_confidence_interval(wall_sec, self.confidence)
+
+
+def _ci_narrow_enough(wall_ns: list[int], timing: TimingConfig) -> bool:
+    values = np.asarray(wall_ns, dtype=float)
+    low, high = mean_confidence_interval(values, timing.confidence)
+    mean = float(values.mean())
+    return mean > 0 and (high - low) <= timing.target_ci_width * mean
+
+
+def measure(
+    fn: Callable[[], ResultT],
+    *,
+    timing: TimingConfig,
+    reset: Callable[[], None] | None = None,
+) -> tuple[ResultT, RuntimeMeasurement]:
+    """
+    Time ``fn`` according to ``timing`` and return its last result.
+
+    ``reset`` is called before every run, e.g. to restore an RNG state so that all
+    repetitions do the same work and return the same result.
+    """
+
+    for _ in range(timing.warmup):
+        if reset is not None:
+            reset()
+        fn()
+
+    wall_ns: list[int] = []
+    cpu_ns: list[int] = []
+    while True:
+        if reset is not None:
+            reset()
+        cpu_start = time.process_time_ns()
+        wall_start = time.perf_counter_ns()
+        result = fn()
+        wall_ns.append(time.perf_counter_ns() - wall_start)
+        cpu_ns.append(time.process_time_ns() - cpu_start)
+
+        if len(wall_ns) >= timing.max_repeats:
+            break
+        if len(wall_ns) >= max(timing.min_repeats, 2) and _ci_narrow_enough(
+            wall_ns, timing
+        ):
+            break
+
+    measurement = RuntimeMeasurement(
+        wall_ns=tuple(wall_ns), cpu_ns=tuple(cpu_ns), confidence=timing.confidence
+    )
+    return result, measurement
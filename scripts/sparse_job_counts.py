@@ -0,0 +1,103 @@
+"""
+Sparse (CSR, one row per time slot) representation of the job-count matrix L.
+
+Job-heavy datasets have hundreds of job types but only a handful of jobs per time
+slot, so most of the (T, J) matrix is zero. ``SparseJobCounts`` stores only the
+non-zero counts of each slot; memory and disk use scale with the number of non-zero
+entries instead of T x J. Schedulers that need the dense matrix call ``to_dense``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from simulator.problem import ProblemInstance
+
+SPARSE_JOB_COUNT_KEYS = ("job_counts_indptr", "job_counts_indices", "job_counts_data")
+
+
+@dataclass(frozen=True)
+class SparseJobCounts:
+    """
+    CSR job-count matrix of shape (T, J).
+
+    Slot ``t`` has counts ``data[indptr[t]:indptr[t + 1]]`` for the job types
+    ``indices[indptr[t]:indptr[t + 1]]``.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    num_jobs: int
+
+    def __post_init__(self) -> None:
+        if self.indptr.ndim != 1 or self.indptr.size == 0:
+            raise ValueError("indptr must be a non-empty 1-D array.")
+        if self.indices.shape != self.data.shape:
+            raise ValueError("indices and data must have the same shape.")
+        if int(self.indptr[-1]) != self.indices.size:
+            raise ValueError("indptr[-1] must equal the number of stored entries.")
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.indptr.size - 1, self.num_jobs)
+
+    @property
+    def nnz(self) -> int:
+        return int(self.indices.size)
+
+    @classmethod
+    def from_dense(cls, job_counts: np.ndarray) -> SparseJobCounts:
+        dense = np.atleast_2d(np.asarray(job_counts))
+        rows, cols = np.nonzero(dense)
+        indptr = np.zeros(dense.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=dense.shape[0]), out=indptr[1:])
+        return cls(
+            indptr=indptr,
+            indices=cols.astype(np.int64),
+            data=dense[rows, cols].astype(np.int64),
+            num_jobs=int(dense.shape[1]),
+        )
+
+    @classmethod
+    def from_arrays(
+        cls, arrays: Mapping[str, np.ndarray], num_jobs: int
+    ) -> SparseJobCounts:
+        indptr, indices, data = (arrays[key] for key in SPARSE_JOB_COUNT_KEYS)
+        return cls(indptr=indptr, indices=indices, data=data, num_jobs=num_jobs)
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        return dict(zip(SPARSE_JOB_COUNT_KEYS, (self.indptr, self.indices, self.data)))
+
+    def to_dense(self) -> np.ndarray:
+        T, J = self.shape
+        dense = np.zeros((T, J), dtype=int)
+        rows = np.repeat(np.arange(T), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
+
+
+@dataclass(frozen=True)
+class SparseProblemInstance:
+    """``ProblemInstance`` counterpart whose job-count matrix is stored sparsely."""
+
+    capacities: np.ndarray
+    requirements: np.ndarray
+    job_counts: SparseJobCounts
+    purchase_costs: np.ndarray
+    running_costs: np.ndarray
+    resource_weights: np.ndarray
+
+    def to_problem(self) -> ProblemInstance:
+        """Build the dense ``ProblemInstance`` expected by the simulator schedulers."""
+        return ProblemInstance(
+            capacities=self.capacities,
+            requirements=self.requirements,
+            job_counts=self.job_counts.to_dense(),
+            purchase_costs=self.purchase_costs,
+            running_costs=self.running_costs,
+            resource_weights=self.resource_weights,
+        )